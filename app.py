@@ -1,12 +1,20 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
 from flask_cors import CORS
-from backend.database.models import db, Match
+from backend.database.models import db, Match, ArchivedMatch, add_missing_columns
+from backend.database.archiver import MatchArchiver
 from backend.api_integration.odds_api_client import OddsAPIClient
 from backend.api_integration.sportsdata_client import SportsDataClient
-from backend.ml_models.prediction_engine import PredictionEngine
+from backend.api_integration.polling_planner import PollingPlanner
+from backend.ml_models.registry import get_prediction_engine, get_online_learner, get_feature_store
 from backend.data_processing.value_bet_detector import ValueBetDetector
+from backend.data_processing.team_resolver import TeamNameResolver, FixtureIndex
+from backend.cache.response_cache import ResponseCache
+from backend.ingestion.work_queue import create_work_queue
+from backend.ingestion.worker import MAINTENANCE_SHARD
 from config.settings import Config
 from datetime import datetime, timedelta
+from sqlalchemy import or_
+import json
 import schedule
 import time
 import threading
@@ -19,16 +27,37 @@ CORS(app)
 db.init_app(app)
 
 # Initialize components
-odds_client = OddsAPIClient()
+polling_planner = PollingPlanner(Config.ODDS_API_MONTHLY_QUOTA, state_file=Config.POLLING_STATE_FILE)
+odds_client = OddsAPIClient(on_response=polling_planner.observe_response)
 sportsdata_client = SportsDataClient()
-prediction_engine = PredictionEngine()
 value_detector = ValueBetDetector()
+team_resolver = TeamNameResolver()
+match_archiver = MatchArchiver(Config.ARCHIVE_AFTER_HOURS, Config.ARCHIVE_BATCH_SIZE)
+response_cache = ResponseCache(version_file=Config.DATA_VERSION_FILE)
+# In workers mode the update endpoints hand their job to the ingestion workers
+ingestion_queue = create_work_queue(Config.INGESTION_QUEUE_URL) if Config.INGESTION_MODE == 'workers' else None
+
+# Odds API fields a record needs before it can be stored (all NOT NULL columns)
+REQUIRED_MATCH_FIELDS = ('id', 'sport_key', 'sport_title', 'home_team', 'away_team', 'commence_time')
+
+# SportsData.io game status -> match_status; games in any other state are skipped
+GAME_STATUSES = {'InProgress': 'In Progress', 'Final': 'Final', 'Awarded': 'Final'}
+# Matches that kicked off this long ago are still checked for a final score
+SCORE_LOOKBACK_HOURS = 24
 
 def init_database():
     with app.app_context():
         db.create_all()
+        add_missing_columns()
         print("Database initialized")
 
+def cached_json_response(cached):
+    """Serve a cached body with a strong ETag, or 304 if the client has it"""
+    response = Response(cached.body, mimetype='application/json')
+    response.set_etag(cached.etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -40,7 +69,21 @@ def get_matches():
         # Get query parameters
         sport = request.args.get('sport', 'soccer')
         show_live = request.args.get('live', 'false').lower() == 'true'
+        page = request.args.get('page')
+        if page is not None:
+            try:
+                page = int(page)
+            except ValueError:
+                page = 0
+            if page < 1:
+                return jsonify({'success': False, 'error': 'page must be a positive integer'}), 400
         
+        cache_key = ('matches', sport, show_live, page)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached_json_response(cached)
+        
+        version = response_cache.version
         query = Match.query
         
         if sport != 'all':
@@ -49,13 +92,65 @@ def get_matches():
         if show_live:
             query = query.filter(Match.is_live == True)
         
-        matches = query.order_by(Match.commence_time).all()
+        query = query.order_by(Match.commence_time)
+        if page is not None:
+            query = query.offset((page - 1) * Config.MATCHES_PAGE_SIZE).limit(Config.MATCHES_PAGE_SIZE)
         
-        return jsonify({
+        matches = query.all()
+        
+        body = json.dumps({
             'success': True,
             'matches': [match.to_dict() for match in matches],
             'count': len(matches)
         })
+        
+        return cached_json_response(response_cache.set(cache_key, body, version))
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/matches/history')
+def get_match_history():
+    """Get current and archived matches"""
+    try:
+        sport = request.args.get('sport', 'all')
+        team = request.args.get('team')
+        try:
+            limit = min(int(request.args.get('limit', 100)), 1000)
+        except ValueError:
+            return jsonify({'success': False, 'error': 'limit must be an integer'}), 400
+        
+        if team:
+            team = team_resolver.canonical(team)
+        
+        matches = match_archiver.get_historical_matches(sport, team, limit)
+        
+        return jsonify({
+            'success': True,
+            'matches': matches,
+            'count': len(matches)
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/polling/status')
+def get_polling_status():
+    """Get the odds polling plan and remaining API quota"""
+    try:
+        return jsonify({
+            'success': True,
+            'polling': polling_planner.status(Config.INGESTION_SPORTS)
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/archive/stats')
+def get_archive_stats():
+    """Get hot/archive table sizes and list query latency with and without the archive"""
+    try:
+        return jsonify({
+            'success': True,
+            'stats': match_archiver.table_stats(Config.MATCHES_PAGE_SIZE)
+        })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -63,6 +158,9 @@ def get_matches():
 def update_matches():
     """Update matches from APIs"""
     try:
+        if ingestion_queue:
+            return queue_ingestion_job('odds', {'sports': Config.INGESTION_SPORTS})
+        
         matches_updated = fetch_and_process_matches()
         return jsonify({
             'success': True,
@@ -72,6 +170,15 @@ def update_matches():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def queue_ingestion_job(kind, payload):
+    """202 response for an update queued for the ingestion workers"""
+    queued = ingestion_queue.put(kind, payload, MAINTENANCE_SHARD)
+    return jsonify({
+        'success': True,
+        'queued': queued,
+        'message': f'Queued {kind} job for the ingestion workers' if queued else f'{kind} job already queued'
+    }), 202
+
 @app.route('/api/predict/custom', methods=['POST'])
 def predict_custom_match():
     """Predict custom match"""
@@ -89,7 +196,7 @@ def predict_custom_match():
             return jsonify({'success': False, 'error': 'Home and away team required'}), 400
         
         # Get prediction
-        prediction = prediction_engine.predict_match(
+        prediction = get_prediction_engine().predict_match(
             home_team, away_team, league, home_odds, away_odds, draw_odds
         )
         
@@ -115,10 +222,69 @@ def predict_custom_match():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/simulate/season')
+def simulate_season():
+    """Simulate the rest of a league season from settled results and remaining fixtures"""
+    try:
+        sport = request.args.get('sport', 'soccer_epl')
+        try:
+            simulations = int(request.args.get('simulations', Config.SIMULATION_RUNS))
+        except ValueError:
+            simulations = 0
+        if simulations < 1:
+            return jsonify({'success': False, 'error': 'simulations must be a positive integer'}), 400
+        simulations = min(simulations, 1000000)
+        
+        from backend.ml_models.season_simulator import SeasonSimulator, standings_from_results
+        
+        settled = []
+        for model in (Match, ArchivedMatch):
+            settled += model.query.filter(model.sport_key == sport, model.match_status == 'Final').all()
+        
+        remaining = Match.query.filter(
+            Match.sport_key == sport,
+            Match.commence_time > datetime.utcnow(),
+            Match.is_live == False
+        ).order_by(Match.commence_time).all()
+        
+        standings = standings_from_results([{
+            'home_team': match.home_team,
+            'away_team': match.away_team,
+            'home_score': match.home_score,
+            'away_score': match.away_score
+        } for match in settled])
+        
+        fixtures = [{
+            'home_team': match.home_team,
+            'away_team': match.away_team,
+            'league': match.league or 'Unknown',
+            'home_odds': match.home_odds,
+            'away_odds': match.away_odds,
+            'draw_odds': match.draw_odds,
+            'commence_time': match.commence_time
+        } for match in remaining]
+        
+        simulator = SeasonSimulator(get_prediction_engine(), simulations, workers=Config.SIMULATION_WORKERS)
+        started = time.perf_counter()
+        result = simulator.simulate(standings, fixtures)
+        
+        return jsonify({
+            'success': True,
+            'sport': sport,
+            'remaining_fixtures': len(fixtures),
+            'elapsed_seconds': round(time.perf_counter() - started, 3),
+            **result
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/live/update')
 def update_live_matches():
     """Update live match data"""
     try:
+        if ingestion_queue:
+            return queue_ingestion_job('live_scores', {})
+        
         updated_count = update_live_scores()
         return jsonify({
             'success': True,
@@ -132,103 +298,151 @@ def update_live_matches():
 def get_sports():
     """Get available sports"""
     try:
+        cached = response_cache.get(('sports',), max_age=Config.SPORTS_CACHE_TTL)
+        if cached is not None:
+            return cached_json_response(cached)
+        
+        version = response_cache.version
         sports = odds_client.get_sports()
-        return jsonify({
+        body = json.dumps({
             'success': True,
             'sports': sports
         })
+        
+        if not sports:
+            # Don't pin an upstream failure in the cache
+            return Response(body, mimetype='application/json')
+        
+        return cached_json_response(response_cache.set(('sports',), body, version))
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
-def fetch_and_process_matches():
+def fetch_and_process_matches(sports=None):
     """Fetch matches from APIs and process them"""
     matches_processed = 0
     
-    try:
-        # Get odds from Odds API
-        soccer_matches = odds_client.get_odds('soccer_epl')
-        # Add more sports as needed
-        # basketball_matches = odds_client.get_odds('basketball_nba')
-        
-        all_matches = soccer_matches  # + basketball_matches
+    for sport in sports or Config.INGESTION_SPORTS:
+        try:
+            # Get odds from Odds API
+            sport_matches = odds_client.get_odds(sport)
+        except Exception as e:
+            print(f"Error fetching matches for {sport}: {e}")
+            continue
         
-        for match_data in all_matches:
+        for start in range(0, len(sport_matches), Config.INGESTION_BATCH_SIZE):
+            batch = sport_matches[start:start + Config.INGESTION_BATCH_SIZE]
             try:
-                process_single_match(match_data)
-                matches_processed += 1
+                matches_processed += process_matches_batch(batch)
             except Exception as e:
-                print(f"Error processing match: {e}")
-                continue
-                
-    except Exception as e:
-        print(f"Error fetching matches: {e}")
+                db.session.rollback()
+                print(f"Error processing match batch, retrying one match at a time: {e}")
+                # Only the record the database rejected is lost
+                for match_data in batch:
+                    try:
+                        matches_processed += process_matches_batch([match_data])
+                    except Exception as e:
+                        db.session.rollback()
+                        print(f"Error processing match: {e}")
+    
+    if matches_processed:
+        response_cache.bump()
     
     print(f"Processed {matches_processed} matches")
     return matches_processed
 
-def process_single_match(match_data):
-    """Process a single match and save to database"""
-    # Extract match information
-    match_id = match_data.get('id')
-    sport_key = match_data.get('sport_key')
-    sport_title = match_data.get('sport_title')
-    home_team = match_data.get('home_team')
-    away_team = match_data.get('away_team')
-    commence_time = datetime.fromisoformat(match_data['commence_time'].replace('Z', '+00:00'))
-    
-    # Extract odds
-    home_odds, away_odds, draw_odds = extract_odds(match_data)
+def process_matches_batch(matches_data):
+    """Upsert a batch of matches with predictions in one query and one commit
     
-    # Check if match exists
-    existing_match = Match.query.filter_by(match_id=match_id).first()
+    Records that can't be parsed or stored are skipped on their own; the
+    rest of the batch is still written.
+    """
+    records = {}
+    for match_data in matches_data:
+        try:
+            fixture = parse_match_record(match_data)
+            # A later copy of the same fixture replaces an earlier one
+            records[match_data['id']] = (match_data, fixture)
+        except Exception as e:
+            print(f"Skipping match {match_data.get('id')}: {e}")
+    if not records:
+        return 0
     
-    if existing_match:
-        # Update existing match
-        match = existing_match
-    else:
-        # Create new match
-        match = Match(match_id=match_id)
+    existing = {
+        match.match_id: match
+        for match in Match.query.filter(Match.match_id.in_(list(records)))
+    }
     
-    # Update match data
-    match.sport_key = sport_key
-    match.sport_title = sport_title
-    match.home_team = home_team
-    match.away_team = away_team
-    match.commence_time = commence_time
-    match.home_odds = home_odds
-    match.away_odds = away_odds
-    match.draw_odds = draw_odds
-    match.league = match_data.get('league', 'Unknown')
+    # One model call for the whole batch
+    fixtures = [fixture for _, fixture in records.values()]
+    probabilities = get_prediction_engine().predict_probabilities(fixtures)
     
-    # Get AI prediction
-    prediction = prediction_engine.predict_match(
-        home_team, away_team, match.league, home_odds, away_odds, draw_odds
-    )
+    written = 0
+    for (match_data, fixture), (home_prob, draw_prob, away_prob) in zip(records.values(), probabilities):
+        try:
+            outcomes = {'home': float(home_prob), 'away': float(away_prob), 'draw': float(draw_prob)}
+            prediction = {
+                'predicted_winner': max(outcomes, key=outcomes.get),
+                'home_win_probability': outcomes['home'],
+                'away_win_probability': outcomes['away'],
+                'draw_probability': outcomes['draw'],
+                'confidence': max(outcomes.values())
+            }
+            
+            # Check for value bets
+            value_bet = value_detector.detect_value_bets(prediction, fixture)
+        except Exception as e:
+            print(f"Skipping match {match_data['id']}: {e}")
+            continue
+        
+        match = existing.get(match_data['id'])
+        if match is None:
+            match = Match(match_id=match_data['id'])
+            db.session.add(match)
+        
+        commence_time = fixture['commence_time']
+        match.sport_key = match_data['sport_key']
+        match.sport_title = match_data['sport_title']
+        match.home_team = fixture['home_team']
+        match.away_team = fixture['away_team']
+        match.commence_time = commence_time
+        match.home_odds = fixture['home_odds']
+        match.away_odds = fixture['away_odds']
+        match.draw_odds = fixture['draw_odds']
+        match.league = fixture['league']
+        
+        match.predicted_winner = prediction['predicted_winner']
+        match.home_win_probability = prediction['home_win_probability']
+        match.away_win_probability = prediction['away_win_probability']
+        match.draw_probability = prediction['draw_probability']
+        match.confidence = prediction['confidence']
+        
+        match.value_bet_detected = value_bet is not None
+        match.value_bet_side = value_bet['side'] if value_bet else None
+        
+        # Check if match is live
+        time_diff = datetime.now().replace(tzinfo=commence_time.tzinfo) - commence_time
+        match.is_live = timedelta(hours=0) <= time_diff <= timedelta(hours=3)
+        written += 1
     
-    match.predicted_winner = prediction['predicted_winner']
-    match.home_win_probability = prediction['home_win_probability']
-    match.away_win_probability = prediction['away_win_probability']
-    match.draw_probability = prediction['draw_probability']
-    match.confidence = prediction['confidence']
+    db.session.commit()
+    return written
+
+def parse_match_record(match_data):
+    """Fixture dict for one Odds API record; raises ValueError if it can't be stored"""
+    missing = [field for field in REQUIRED_MATCH_FIELDS if not match_data.get(field)]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
     
-    # Check for value bets
-    value_bet = value_detector.detect_value_bets(prediction, {
+    home_odds, away_odds, draw_odds = extract_odds(match_data)
+    return {
+        'home_team': match_data['home_team'],
+        'away_team': match_data['away_team'],
+        'league': match_data.get('league', 'Unknown'),
         'home_odds': home_odds,
         'away_odds': away_odds,
-        'draw_odds': draw_odds
-    })
-    
-    match.value_bet_detected = value_bet is not None
-    match.value_bet_side = value_bet['side'] if value_bet else None
-    
-    # Check if match is live
-    time_diff = datetime.now().replace(tzinfo=commence_time.tzinfo) - commence_time
-    match.is_live = timedelta(hours=0) <= time_diff <= timedelta(hours=3)
-    
-    if not existing_match:
-        db.session.add(match)
-    
-    db.session.commit()
+        'draw_odds': draw_odds,
+        'commence_time': datetime.fromisoformat(match_data['commence_time'].replace('Z', '+00:00'))
+    }
 
 def extract_odds(match_data):
     """Extract the best odds from bookmakers"""
@@ -251,34 +465,173 @@ def extract_odds(match_data):
     return home_odds, away_odds, draw_odds
 
 def update_live_scores():
-    """Update live scores for matches"""
+    """Update scores and status from SportsData.io for started matches without a final result
+    
+    Finished games are read too, so the final score and 'Final' status come
+    from the feed; settle_finished_matches only acts on those.
+    """
     updated_count = 0
     
     try:
-        # Get live matches from database
-        live_matches = Match.query.filter(Match.is_live == True).all()
-        
-        for match in live_matches:
-            # In a real implementation, you would fetch actual live data
-            # For now, we'll simulate live updates
-            if match.is_live:
-                # Simulate score changes (remove this in production)
-                if datetime.utcnow().minute % 5 == 0:  # Change every 5 minutes for demo
-                    match.home_score += 1 if match.home_score < 5 else 0
-                    match.away_score += 1 if match.away_score < 5 else 0
-                    match.match_status = "In Progress"
-                    db.session.commit()
-                    updated_count += 1
+        now = datetime.utcnow()
+        started = Match.query.filter(
+            Match.commence_time <= now,
+            or_(Match.commence_time >= now - timedelta(hours=SCORE_LOOKBACK_HOURS),
+                Match.match_status == 'In Progress'),
+            or_(Match.match_status.is_(None), Match.match_status != 'Final')
+        ).all()
+        if not started:
+            return 0
+        
+        # Index by canonical team pair so each feed record is a dict lookup
+        fixture_index = FixtureIndex(team_resolver).build(started)
+        
+        updates = {}
+        for date in sportsdata_dates(started):
+            for game in sportsdata_client.get_games(date, GAME_STATUSES):
+                match = fixture_index.lookup(
+                    game.get('HomeTeamName') or game.get('HomeTeam'),
+                    game.get('AwayTeamName') or game.get('AwayTeam'),
+                    parse_sportsdata_time(game.get('DateTime'))
+                )
+                if match is None:
+                    continue
+                
+                status = GAME_STATUSES[game['Status']]
+                updates[match.id] = {
+                    'id': match.id,
+                    'home_score': game.get('HomeTeamScore') or 0,
+                    'away_score': game.get('AwayTeamScore') or 0,
+                    'match_status': status,
+                    'is_live': status == 'In Progress',
+                    'updated_at': now
+                }
+        
+        if updates:
+            db.session.bulk_update_mappings(Match, list(updates.values()))
+            db.session.commit()
+            updated_count = len(updates)
+            response_cache.bump()
     
     except Exception as e:
+        db.session.rollback()
         print(f"Error updating live scores: {e}")
     
     return updated_count
 
+def sportsdata_dates(matches):
+    """GamesByDate days covering these kickoffs (the feed's days are US Eastern)"""
+    return sorted({
+        (match.commence_time - timedelta(hours=offset)).strftime('%Y-%m-%d')
+        for match in matches
+        for offset in (0, 5)
+    })
+
+def parse_sportsdata_time(value):
+    """Parse a SportsData.io DateTime field (UTC, no offset)"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', ''))
+    except ValueError:
+        return None
+
+def settle_finished_matches():
+    """Feed matches the score feed reported as Final to team form and the model, once each"""
+    with app.app_context():
+        finished = Match.query.filter(
+            Match.match_status == 'Final',
+            Match.settled_at.is_(None)
+        ).order_by(Match.commence_time).all()
+        if not finished:
+            return 0
+        
+        results = [{
+            'match_id': match.match_id,
+            'home_team': match.home_team,
+            'away_team': match.away_team,
+            'league': match.league or 'Unknown',
+            'home_odds': match.home_odds,
+            'away_odds': match.away_odds,
+            'draw_odds': match.draw_odds,
+            'outcome': match_outcome(match.home_score, match.away_score),
+            'played_at': match.commence_time
+        } for match in finished]
+        
+        if Config.PREDICTION_MODEL == 'sgd':
+            # Queue with pre-match features before the results change team form
+            get_online_learner().submit(results)
+        
+        now = datetime.utcnow()
+        for match in finished:
+            match.settled_at = now
+        db.session.commit()
+        
+        feature_store = get_feature_store()
+        if feature_store:
+            for match in finished:
+                feature_store.record_result(match.home_team, match.away_team,
+                                            match.home_score, match.away_score, match.commence_time)
+            feature_store.save()
+        
+        if Config.PREDICTION_MODEL == 'sgd':
+            # Each call is bounded; a backlog drains over several runs
+            get_online_learner().update()
+        
+        return len(finished)
+
+def rebuild_feature_store():
+    """Rebuild team form from every settled result in the hot and archive tables"""
+    feature_store = get_feature_store()
+    if not feature_store:
+        return 0
+    
+    with app.app_context():
+        teams = feature_store.build_from_results(match_archiver.settled_results())
+    feature_store.save()
+    
+    print(f"Team form rebuilt for {teams} teams")
+    return teams
+
+def prepare_prediction_state():
+    """Load or train the model, then rebuild team form from real results"""
+    get_prediction_engine().ensure_trained()
+    rebuild_feature_store()
+
+def match_outcome(home_score, away_score):
+    """Result label used by the prediction model"""
+    if home_score > away_score:
+        return 'home'
+    if away_score > home_score:
+        return 'away'
+    return 'draw'
+
+def archive_finished_matches():
+    """Move old finished matches out of the hot table"""
+    with app.app_context():
+        archived = match_archiver.archive_finished_matches()
+        if archived:
+            response_cache.bump()
+        return archived
+
+def poll_due_sports():
+    """Fetch odds only for the sports the polling planner says are due"""
+    due = polling_planner.due_sports(Config.INGESTION_SPORTS)
+    if not due:
+        return 0
+    return fetch_and_process_matches(due)
+
+def run_in_app_context(job, *args):
+    """Run a database job from a scheduler or worker thread"""
+    with app.app_context():
+        return job(*args)
+
 def schedule_updates():
     """Schedule background updates"""
-    schedule.every(5).minutes.do(fetch_and_process_matches)
-    schedule.every(1).minutes.do(update_live_scores)
+    schedule.every(Config.POLLING_CHECK_INTERVAL).seconds.do(run_in_app_context, poll_due_sports)
+    schedule.every(1).minutes.do(run_in_app_context, update_live_scores)
+    schedule.every(5).minutes.do(settle_finished_matches)
+    schedule.every(Config.ARCHIVE_INTERVAL).seconds.do(archive_finished_matches)
     
     while True:
         schedule.run_pending()
@@ -287,12 +640,15 @@ def schedule_updates():
 if __name__ == '__main__':
     init_database()
     
-    # Start background scheduler in a separate thread
-    scheduler_thread = threading.Thread(target=schedule_updates, daemon=True)
-    scheduler_thread.start()
-    
-    # Initial data fetch
-    fetch_and_process_matches()
+    if Config.INGESTION_MODE == 'inline':
+        prepare_prediction_state()
+        
+        # Start background scheduler in a separate thread
+        scheduler_thread = threading.Thread(target=schedule_updates, daemon=True)
+        scheduler_thread.start()
+        
+        # Initial data fetch
+        run_in_app_context(poll_due_sports)
     
     print("Starting Sports Analytics Platform...")
     app.run(debug=True, host='0.0.0.0', port=5000)
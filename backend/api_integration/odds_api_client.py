@@ -4,9 +4,18 @@ from datetime import datetime, timedelta
 from config.settings import Config
 
 class OddsAPIClient:
-    def __init__(self):
+    def __init__(self, on_response=None):
         self.api_key = Config.ODDS_API_KEY
         self.base_url = Config.ODDS_API_BASE_URL
+        # Called with (sport, headers, data) so quota usage can be tracked
+        self.on_response = on_response
+    
+    def _notify(self, sport, response, data=None):
+        if self.on_response:
+            try:
+                self.on_response(sport, response.headers, data)
+            except Exception as e:
+                print(f"Error recording API response: {e}")
     
     def get_sports(self):
         """Get available sports"""
@@ -26,8 +35,12 @@ class OddsAPIClient:
             print(f"Exception in get_sports: {e}")
             return []
     
-    def get_odds(self, sport='soccer_epl', regions='us,uk,eu', markets='h2h,spreads'):
-        """Get odds for specified sport"""
+    def get_odds(self, sport='soccer_epl', regions='us,uk,eu', markets='h2h'):
+        """Get odds for specified sport
+
+        Each call costs one credit per market per region, and ingestion only
+        reads h2h, so asking for more markets just burns quota.
+        """
         url = f"{self.base_url}/sports/{sport}/odds"
         
         params = {
@@ -42,9 +55,11 @@ class OddsAPIClient:
             response = requests.get(url, params=params)
             if response.status_code == 200:
                 data = response.json()
+                self._notify(sport, response, data)
                 print(f"Retrieved {len(data)} matches for {sport}")
                 return data
             else:
+                self._notify(sport, response)
                 print(f"Error fetching odds: {response.status_code} - {response.text}")
                 return []
         except Exception as e:
@@ -66,6 +81,7 @@ class OddsAPIClient:
         try:
             response = requests.get(url, params=params)
             matches = response.json()
+            self._notify(sport, response, matches)
             
             # Filter for live matches (happening now)
             live_matches = []
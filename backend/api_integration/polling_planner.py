@@ -0,0 +1,266 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies
+    fcntl = None
+
+# (seconds until kickoff, poll interval): the first tier a sport's nearest
+# fixture falls into sets how often that sport is polled
+POLL_TIERS = [
+    (0, 120),                # live
+    (3600, 300),             # kicking off within the hour
+    (6 * 3600, 900),
+    (24 * 3600, 3600),
+    (72 * 3600, 3 * 3600),
+]
+DISTANT_INTERVAL = 12 * 3600
+# Even a starved sport is polled this often, to discover new fixtures
+MAX_INTERVAL = 48 * 3600
+LIVE_WINDOW = 3 * 3600
+# A requested poll that hasn't been observed by then is assumed lost
+REQUEST_TIMEOUT = 600
+MAX_KICKOFFS_PER_SPORT = 50
+
+
+class PollingPlanner:
+    """Decides which sports to poll so odds stay fresh within the API quota
+
+    One poll per sport covers all of its fixtures, so sports (not fixtures)
+    are scheduled: each gets the interval of its most urgent fixture, and the
+    least urgent ones are stretched when that would outrun the credits left
+    before the quota resets.
+    """
+
+    def __init__(self, monthly_quota=500, reserve_fraction=0.05, state_file=None):
+        self.monthly_quota = monthly_quota
+        self.reserve = int(monthly_quota * reserve_fraction)
+        self.state_file = state_file
+        self.state_mtime = None
+        self.lock = threading.Lock()
+        self.requests_remaining = None
+        self.requests_used = None
+        # When the quota headers were read; they mean nothing after the next reset
+        self.quota_observed_at = None
+        self.sports = {}
+        # sport -> when this process asked for a poll; not shared, only the
+        # requesting process needs to know a poll is already on its way
+        self.requested = {}
+
+    def observe_response(self, sport, headers, fixtures=None, now=None):
+        """Record quota headers and fixture kickoffs from an Odds API response"""
+        now = now or time.time()
+        # Other processes write the same file: reload, merge and save under one lock
+        with self.lock, _file_lock(self.state_file):
+            self._load_state(force=True)
+            remaining = _int_header(headers, 'x-requests-remaining')
+            used = _int_header(headers, 'x-requests-used')
+            if remaining is not None or used is not None:
+                self.requests_remaining = remaining
+                self.requests_used = used
+                self.quota_observed_at = now
+
+            if sport is not None:
+                entry = self.sports.setdefault(sport, {'kickoffs': [], 'last_polled': None, 'cost': 1})
+                entry['last_polled'] = now
+                cost = _int_header(headers, 'x-requests-last')
+                if cost is not None:
+                    entry['cost'] = max(cost, 1)
+                if fixtures is not None:
+                    entry['kickoffs'] = _relevant_kickoffs(fixtures, now)
+
+            self._save_state()
+
+    def interval_for(self, sport, now=None):
+        """Unthrottled poll interval for a sport, from its most urgent fixture"""
+        now = now or time.time()
+        entry = self.sports.get(sport)
+        if not entry or not entry['kickoffs']:
+            return DISTANT_INTERVAL
+
+        upcoming = [kickoff - now for kickoff in entry['kickoffs'] if kickoff + LIVE_WINDOW > now]
+        if not upcoming:
+            return DISTANT_INTERVAL
+        until_kickoff = min(upcoming)
+
+        for limit, interval in POLL_TIERS:
+            if until_kickoff <= limit:
+                return interval
+        return DISTANT_INTERVAL
+
+    def remaining_credits(self, now=None):
+        """Credits left this month, from the last quota headers seen since the reset"""
+        now = now or time.time()
+        if self.quota_observed_at is None or self.quota_observed_at < _last_reset(now):
+            # Nothing observed this month: assume the quota has reset
+            return self.monthly_quota
+        if self.requests_remaining is not None:
+            return self.requests_remaining
+        return self.monthly_quota - (self.requests_used or 0)
+
+    def plan(self, sports, now=None):
+        """Effective poll interval per sport within the remaining quota
+
+        Every sport is first guaranteed one poll per MAX_INTERVAL, even when
+        the budget looks spent: that probe is also how a reset is noticed.
+        The rest of the credit rate left until the reset goes to sports in
+        order of urgency, so live and near-kickoff sports keep their tier
+        interval and distant ones absorb the shortfall.
+        """
+        now = now or time.time()
+        spendable = self.remaining_credits(now) - self.reserve
+        if spendable <= 0:
+            return {sport: MAX_INTERVAL for sport in sports}
+
+        # Credits per second available until the quota resets
+        available = spendable / max(_seconds_until_reset(now), 1)
+        costs = {sport: self.sports.get(sport, {}).get('cost', 1) for sport in sports}
+        rates = {sport: costs[sport] / MAX_INTERVAL for sport in sports}
+        available -= sum(rates.values())
+
+        for sport in sorted(sports, key=lambda sport: self.interval_for(sport, now)):
+            wanted = costs[sport] / self.interval_for(sport, now) - rates[sport]
+            extra = min(max(wanted, 0.0), max(available, 0.0))
+            rates[sport] += extra
+            available -= extra
+
+        return {sport: costs[sport] / rates[sport] for sport in sports}
+
+    def mark_requested(self, sports, now=None):
+        """Note that polls were handed off (e.g. queued for a worker) but not made yet"""
+        now = now or time.time()
+        with self.lock:
+            for sport in sports:
+                self.requested[sport] = now
+
+    def due_sports(self, sports, now=None):
+        """Sports from the candidate list whose next poll is due and not already requested"""
+        now = now or time.time()
+        with self.lock:
+            self._load_state()
+            sports = list(dict.fromkeys(sports))  # merge duplicate requests for a sport
+            intervals = self.plan(sports, now)
+
+            due = []
+            for sport in sports:
+                last_polled = self.sports.get(sport, {}).get('last_polled')
+                requested = self.requested.get(sport)
+                if requested is not None and requested > (last_polled or 0) and \
+                        now - requested < REQUEST_TIMEOUT:
+                    continue
+                if last_polled is None or now - last_polled >= intervals[sport]:
+                    due.append(sport)
+            return due
+
+    def status(self, sports, now=None):
+        """Current plan, for monitoring"""
+        now = now or time.time()
+        with self.lock:
+            self._load_state()
+            intervals = self.plan(sports, now)
+            return {
+                'requests_remaining': self.requests_remaining,
+                'requests_used': self.requests_used,
+                'quota_observed_at': self.quota_observed_at,
+                'credits_available': self.remaining_credits(now),
+                'sports': {
+                    sport: {
+                        'tier_interval_seconds': self.interval_for(sport, now),
+                        'planned_interval_seconds': intervals.get(sport),
+                        'last_polled': self.sports.get(sport, {}).get('last_polled'),
+                        'cost': self.sports.get(sport, {}).get('cost', 1)
+                    }
+                    for sport in sports
+                }
+            }
+
+    def _load_state(self, force=False):
+        """Pick up observations written by other processes
+
+        force skips the mtime check, which can miss a write made within the
+        filesystem's timestamp resolution.
+        """
+        if not self.state_file:
+            return
+        try:
+            mtime = os.stat(self.state_file).st_mtime_ns
+            if mtime == self.state_mtime and not force:
+                return
+            with open(self.state_file) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.state_mtime = mtime
+        self.requests_remaining = state.get('requests_remaining')
+        self.requests_used = state.get('requests_used')
+        self.quota_observed_at = state.get('quota_observed_at')
+        self.sports = state.get('sports', {})
+
+    def _save_state(self):
+        if not self.state_file:
+            return
+        temp_path = f"{self.state_file}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({
+                'requests_remaining': self.requests_remaining,
+                'requests_used': self.requests_used,
+                'quota_observed_at': self.quota_observed_at,
+                'sports': self.sports
+            }, f)
+        os.replace(temp_path, self.state_file)
+        self.state_mtime = os.stat(self.state_file).st_mtime_ns
+
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive lock across processes on a sidecar of path; no-op without a path or fcntl"""
+    if not path or fcntl is None:
+        yield
+        return
+    with open(f"{path}.lock", 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _int_header(headers, name):
+    try:
+        value = headers.get(name)
+        return int(float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _relevant_kickoffs(fixtures, now):
+    """Epoch kickoffs that are live or upcoming, soonest first"""
+    kickoffs = []
+    for fixture in fixtures:
+        try:
+            kickoff = datetime.fromisoformat(fixture['commence_time'].replace('Z', '+00:00')).timestamp()
+        except (KeyError, AttributeError, ValueError):
+            continue
+        if kickoff + LIVE_WINDOW > now:
+            kickoffs.append(kickoff)
+    return sorted(kickoffs)[:MAX_KICKOFFS_PER_SPORT]
+
+
+# Quota is treated as resetting at the start of each calendar month (UTC)
+def _last_reset(now):
+    current = datetime.fromtimestamp(now, tz=timezone.utc)
+    return datetime(current.year, current.month, 1, tzinfo=timezone.utc).timestamp()
+
+
+def _seconds_until_reset(now):
+    current = datetime.fromtimestamp(now, tz=timezone.utc)
+    if current.month == 12:
+        reset = datetime(current.year + 1, 1, 1, tzinfo=timezone.utc)
+    else:
+        reset = datetime(current.year, current.month + 1, 1, tzinfo=timezone.utc)
+    return reset.timestamp() - now
@@ -1,4 +1,5 @@
 import requests
+from datetime import datetime
 from config.settings import Config
 
 class SportsDataClient:
@@ -25,9 +26,10 @@ class SportsDataClient:
             print(f"Exception in get_soccer_odds: {e}")
             return []
     
-    def get_live_games(self):
-        """Get live games data"""
-        url = f"{self.base_url}/scores/json/GamesByDate/2023-01-01"
+    def get_games(self, date=None, statuses=None):
+        """Games on a date (YYYY-MM-DD, default today), optionally only those in statuses"""
+        date = date or datetime.utcnow().strftime('%Y-%m-%d')
+        url = f"{self.base_url}/soccer/scores/json/GamesByDate/{date}"
         
         headers = {
             'Ocp-Apim-Subscription-Key': self.api_key
@@ -37,10 +39,15 @@ class SportsDataClient:
             response = requests.get(url, headers=headers)
             if response.status_code == 200:
                 games = response.json()
-                # Filter for live games
-                live_games = [game for game in games if game.get('Status') == 'InProgress']
-                return live_games
+                if statuses is not None:
+                    games = [game for game in games if game.get('Status') in statuses]
+                return games
+            print(f"SportsData.io API error: {response.status_code}")
             return []
         except Exception as e:
-            print(f"Exception in get_live_games: {e}")
+            print(f"Exception in get_games: {e}")
             return []
+    
+    def get_live_games(self, date=None):
+        """Get live games data"""
+        return self.get_games(date, ('InProgress',))
@@ -0,0 +1,88 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class CachedResponse:
+    def __init__(self, body, version):
+        self.body = body
+        self.version = version
+        self.etag = hashlib.sha1(body.encode('utf-8')).hexdigest()
+        self.created_at = time.monotonic()
+
+
+class ResponseCache:
+    """Rendered JSON bodies keyed by request, valid until the data version moves"""
+
+    def __init__(self, max_entries=256, version_file=None):
+        self.max_entries = max_entries
+        # Writers in other processes (ingestion workers) touch this file
+        self.version_file = version_file
+        self.local_version = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    @property
+    def version(self):
+        """Local bump counter combined with the shared version file's mtime"""
+        if not self.version_file:
+            return self.local_version
+        try:
+            return (self.local_version, os.stat(self.version_file).st_mtime_ns)
+        except OSError:
+            return (self.local_version, 0)
+
+    def bump(self):
+        """Mark all cached responses stale; called after every ingestion write"""
+        with self.lock:
+            self.local_version += 1
+            self.entries.clear()
+        if self.version_file:
+            touch_version_file(self.version_file)
+        return self.version
+
+    def get(self, key, max_age=None):
+        """Return the cached response for key if it is still current"""
+        version = self.version
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry.version != version:
+                return None
+            if max_age is not None and time.monotonic() - entry.created_at > max_age:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key, body, version=None):
+        """Store a rendered body; version is the one read before rendering"""
+        current = self.version
+        with self.lock:
+            version = current if version is None else version
+            entry = CachedResponse(body, version)
+            # A bump during rendering means this body may already be stale
+            if version == current:
+                self.entries[key] = entry
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+            return entry
+
+
+def touch_version_file(path):
+    """Advance the shared data version seen by every process"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'a'):
+        pass
+    # Explicit timestamp: some filesystems only update mtime at coarse resolution
+    now = time.time_ns()
+    try:
+        previous = os.stat(path).st_mtime_ns
+    except OSError:
+        previous = 0
+    stamp = max(now, previous + 1000)
+    os.utime(path, ns=(stamp, stamp))
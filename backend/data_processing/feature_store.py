@@ -0,0 +1,259 @@
+from datetime import datetime
+import os
+import joblib
+import numpy as np
+import pandas as pd
+
+WINDOWS = (5, 10)
+SPLIT_WINDOW = 5
+MAX_REST_DAYS = 30
+DEFAULT_REST_DAYS = 7
+
+# Per-match columns kept in each team's ring buffer
+GOALS_FOR, GOALS_AGAINST, POINTS, XG_FOR, XG_AGAINST, IS_HOME = range(6)
+RESULT_COLUMNS = ['goals_for', 'goals_against', 'points', 'xg_for', 'xg_against']
+
+TEAM_FEATURES = [f"{name}_{window}" for window in WINDOWS for name in RESULT_COLUMNS] + \
+    [f"home_points_{SPLIT_WINDOW}", f"away_points_{SPLIT_WINDOW}"]
+
+FORM_FEATURES = [f"{side}_{name}" for side in ('home', 'away') for name in TEAM_FEATURES] + \
+    ['home_rest_days', 'away_rest_days']
+
+# League-average prior for teams without history
+DEFAULT_TEAM_FEATURES = np.array(
+    [1.4, 1.4, 1.35, 1.4, 1.4] * len(WINDOWS) + [1.6, 1.1], dtype=float
+)
+
+
+class TeamForm:
+    """Fixed-size ring buffer of a team's most recent results"""
+
+    def __init__(self, size):
+        self.results = np.zeros((size, 6), dtype=float)
+        self.count = 0
+        self.last_played = None
+        self.features = DEFAULT_TEAM_FEATURES
+
+    def push(self, row, played_at):
+        self.results = np.roll(self.results, -1, axis=0)
+        self.results[-1] = row
+        self.count = min(self.count + 1, len(self.results))
+        if self.last_played is None or played_at >= self.last_played:
+            self.last_played = played_at
+        self.features = self._compute_features()
+
+    def _compute_features(self):
+        recent = self.results[-self.count:]
+        features = []
+        for window in WINDOWS:
+            features.extend(recent[-window:, :IS_HOME].mean(axis=0))
+
+        defaults = DEFAULT_TEAM_FEATURES[-2:]
+        for i, flag in enumerate((1.0, 0.0)):
+            split = recent[recent[:, IS_HOME] == flag][-SPLIT_WINDOW:, POINTS]
+            features.append(split.mean() if len(split) else defaults[i])
+
+        return np.array(features, dtype=float)
+
+
+class TeamFormFeatureStore:
+    """Precomputed rolling form per team, updated as results settle
+
+    Serving state is built from real settled results only and saved to
+    path, so it survives restarts and other processes can load it.
+    """
+
+    def __init__(self, path=None):
+        self.buffer_size = max(WINDOWS)
+        self.path = path
+        self.mtime = None
+        self.teams = {}
+
+    def record_result(self, home_team, away_team, home_goals, away_goals, played_at,
+                      home_xg=None, away_xg=None):
+        """Fold one settled result into both teams' windows"""
+        home_xg = home_goals if home_xg is None else home_xg
+        away_xg = away_goals if away_xg is None else away_xg
+        home_points, away_points = _points(home_goals, away_goals)
+
+        played_at = _naive_utc(played_at)
+        self._team(home_team).push(
+            [home_goals, away_goals, home_points, home_xg, away_xg, 1.0], played_at)
+        self._team(away_team).push(
+            [away_goals, home_goals, away_points, away_xg, home_xg, 0.0], played_at)
+
+    def _team(self, team):
+        form = self.teams.get(team)
+        if form is None:
+            form = self.teams[team] = TeamForm(self.buffer_size)
+        return form
+
+    def get_fixture_features(self, home_team, away_team, kickoff=None):
+        """Form feature row in FORM_FEATURES order"""
+        kickoff = _naive_utc(kickoff or datetime.utcnow())
+        home_form = self.teams.get(home_team)
+        away_form = self.teams.get(away_team)
+
+        return np.concatenate([
+            home_form.features if home_form else DEFAULT_TEAM_FEATURES,
+            away_form.features if away_form else DEFAULT_TEAM_FEATURES,
+            [_rest_days(home_form, kickoff), _rest_days(away_form, kickoff)]
+        ])
+
+    def get_batch_features(self, fixtures):
+        """Feature matrix for (home_team, away_team, kickoff) tuples"""
+        if not fixtures:
+            return np.empty((0, len(FORM_FEATURES)))
+        return np.vstack([self.get_fixture_features(*fixture) for fixture in fixtures])
+
+    def rolling_features(self, history):
+        """Pre-match form for every row of a results DataFrame, vectorized
+
+        history needs home_team, away_team, home_goals, away_goals and
+        played_at columns; home_xg/away_xg are optional.
+        """
+        long = _team_rows(history)
+        by_team = long.groupby('team', sort=False)
+
+        # Shift so each match only sees results from before it
+        previous = by_team[RESULT_COLUMNS].shift(1)
+        features = pd.DataFrame(index=long.index)
+        for window in WINDOWS:
+            rolled = (previous.groupby(long['team'], sort=False)
+                      .rolling(window, min_periods=1).mean()
+                      .reset_index(level=0, drop=True))
+            for name in RESULT_COLUMNS:
+                features[f"{name}_{window}"] = rolled[name]
+
+        for flag, name in ((1.0, f"home_points_{SPLIT_WINDOW}"), (0.0, f"away_points_{SPLIT_WINDOW}")):
+            side_rows = long[long['is_home'] == flag]
+            after = (side_rows.groupby('team', sort=False)['points']
+                     .rolling(SPLIT_WINDOW, min_periods=1).mean()
+                     .reset_index(level=0, drop=True))
+            # Split form after each match, carried forward to the team's next match
+            features[name] = after.reindex(long.index)
+            features[name] = features[name].groupby(long['team'], sort=False).shift(1)
+            features[name] = features[name].groupby(long['team'], sort=False).ffill()
+
+        rest = by_team['played_at'].diff().dt.total_seconds() / 86400
+        features['rest_days'] = rest.clip(upper=MAX_REST_DAYS).fillna(DEFAULT_REST_DAYS)
+
+        for i, name in enumerate(TEAM_FEATURES):
+            features[name] = features[name].fillna(DEFAULT_TEAM_FEATURES[i])
+
+        features['match_index'] = long['match_index']
+        features['is_home'] = long['is_home']
+        home = features[features['is_home'] == 1.0].set_index('match_index')
+        away = features[features['is_home'] == 0.0].set_index('match_index')
+
+        result = pd.DataFrame(index=history.index)
+        for name in TEAM_FEATURES:
+            result[f"home_{name}"] = home[name]
+            result[f"away_{name}"] = away[name]
+        result['home_rest_days'] = home['rest_days']
+        result['away_rest_days'] = away['rest_days']
+
+        return result[FORM_FEATURES]
+
+    def build_from_history(self, history):
+        """Rebuild every team's window from a results DataFrame"""
+        long = _team_rows(history)
+        recent = long.groupby('team', sort=False).tail(self.buffer_size)
+
+        teams = {}
+        columns = RESULT_COLUMNS + ['is_home']
+        for team, rows in recent.groupby('team', sort=False):
+            form = TeamForm(self.buffer_size)
+            values = rows[columns].to_numpy(dtype=float)
+            form.results[-len(values):] = values
+            form.count = len(values)
+            form.last_played = rows['played_at'].iloc[-1].to_pydatetime()
+            form.features = form._compute_features()
+            teams[team] = form
+
+        # Swap in one assignment so lookups never see a half-built store
+        self.teams = teams
+        return len(teams)
+
+    def build_from_results(self, results):
+        """Rebuild from settled result dicts (home_team, away_team, home_goals, away_goals, played_at)"""
+        if not results:
+            self.teams = {}
+            return 0
+        return self.build_from_history(pd.DataFrame(results))
+
+    def save(self):
+        """Write the serving state to path, replacing the old file atomically"""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        joblib.dump(self.teams, temp_path)
+        os.replace(temp_path, self.path)
+        self.mtime = os.stat(self.path).st_mtime_ns
+
+    def load(self):
+        """Load the saved state if the file changed since it was last read"""
+        if not self.path:
+            return False
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            if mtime == self.mtime:
+                return False
+            teams = joblib.load(self.path)
+        except Exception as e:
+            if os.path.exists(self.path):
+                print(f"Error loading team form: {e}")
+            return False
+        self.teams = teams
+        self.mtime = mtime
+        return True
+
+
+def _points(home_goals, away_goals):
+    if home_goals > away_goals:
+        return 3.0, 0.0
+    if home_goals < away_goals:
+        return 0.0, 3.0
+    return 1.0, 1.0
+
+
+def _naive_utc(value):
+    if value.tzinfo is not None:
+        value = (value - value.utcoffset()).replace(tzinfo=None)
+    return value
+
+
+def _rest_days(form, kickoff):
+    if form is None or form.last_played is None:
+        return float(DEFAULT_REST_DAYS)
+    days = (kickoff - form.last_played).total_seconds() / 86400
+    return float(min(max(days, 0.0), MAX_REST_DAYS))
+
+
+def _team_rows(history):
+    """One row per team per match, sorted by team and kickoff"""
+    home_goals = history['home_goals'].astype(float)
+    away_goals = history['away_goals'].astype(float)
+    home_xg = history['home_xg'].astype(float) if 'home_xg' in history else home_goals
+    away_xg = history['away_xg'].astype(float) if 'away_xg' in history else away_goals
+    home_points = np.select([home_goals > away_goals, home_goals == away_goals], [3.0, 1.0], 0.0)
+    away_points = np.select([away_goals > home_goals, home_goals == away_goals], [3.0, 1.0], 0.0)
+    played_at = pd.to_datetime(history['played_at'], utc=True).dt.tz_localize(None)
+
+    home = pd.DataFrame({
+        'match_index': history.index, 'team': history['home_team'], 'played_at': played_at,
+        'goals_for': home_goals, 'goals_against': away_goals, 'points': home_points,
+        'xg_for': home_xg, 'xg_against': away_xg, 'is_home': 1.0
+    })
+    away = pd.DataFrame({
+        'match_index': history.index, 'team': history['away_team'], 'played_at': played_at,
+        'goals_for': away_goals, 'goals_against': home_goals, 'points': away_points,
+        'xg_for': away_xg, 'xg_against': home_xg, 'is_home': 0.0
+    })
+
+    return (pd.concat([home, away], ignore_index=True)
+            .sort_values(['team', 'played_at', 'match_index'], kind='stable')
+            .reset_index(drop=True))
@@ -0,0 +1,145 @@
+import re
+import unicodedata
+from difflib import get_close_matches
+
+# Canonical team names (as returned by the Odds API) mapped to the other
+# spellings used by SportsData.io and the bookmakers
+TEAM_ALIASES = {
+    'Arsenal': ['Arsenal FC', 'The Gunners'],
+    'Aston Villa': ['Villa', 'Aston Villa FC'],
+    'AFC Bournemouth': ['Bournemouth'],
+    'Brentford': ['Brentford FC'],
+    'Brighton and Hove Albion': ['Brighton', 'Brighton & Hove Albion', 'Brighton Hove Albion'],
+    'Burnley': ['Burnley FC'],
+    'Chelsea': ['Chelsea FC'],
+    'Crystal Palace': ['Palace', 'Crystal Palace FC'],
+    'Everton': ['Everton FC'],
+    'Fulham': ['Fulham FC'],
+    'Leeds United': ['Leeds', 'Leeds Utd'],
+    'Leicester City': ['Leicester'],
+    'Liverpool': ['Liverpool FC'],
+    'Luton Town': ['Luton'],
+    'Manchester City': ['Man City', 'Manchester City FC', 'Man. City'],
+    'Manchester United': ['Man United', 'Man Utd', 'Manchester Utd', 'Man U', 'Man. United'],
+    'Newcastle United': ['Newcastle', 'Newcastle Utd'],
+    'Nottingham Forest': ["Nott'm Forest", 'Nottm Forest', 'Forest'],
+    'Sheffield United': ['Sheffield Utd', 'Sheff Utd'],
+    'Southampton': ['Southampton FC'],
+    'Tottenham Hotspur': ['Tottenham', 'Spurs'],
+    'West Ham United': ['West Ham', 'West Ham Utd'],
+    'Wolverhampton Wanderers': ['Wolves', 'Wolverhampton'],
+    'Ipswich Town': ['Ipswich'],
+}
+
+# Tokens that carry no identity ("FC Barcelona" == "Barcelona")
+NOISE_TOKENS = {'fc', 'afc', 'cf', 'sc', 'the', 'club', 'de'}
+
+
+def normalize_team_name(name):
+    """Reduce a team name to a lowercase, accent- and punctuation-free key"""
+    if not name:
+        return ''
+
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(c for c in name if not unicodedata.combining(c))
+    name = name.lower().replace('&', ' and ')
+    tokens = re.sub(r"[^a-z0-9 ]+", ' ', name).split()
+    tokens = [token for token in tokens if token not in NOISE_TOKENS]
+
+    return ' '.join(tokens)
+
+
+class TeamNameResolver:
+    def __init__(self, aliases=None, fuzzy_cutoff=0.85):
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.index = {}  # normalized key -> canonical name
+        self.fuzzy_cache = {}  # normalized key -> canonical name or None
+
+        for canonical, team_aliases in (aliases or TEAM_ALIASES).items():
+            self.add_team(canonical, team_aliases)
+
+    def add_team(self, canonical, aliases=()):
+        """Register a canonical team name and its aliases"""
+        for name in (canonical, *aliases):
+            key = normalize_team_name(name)
+            if key:
+                self.index[key] = canonical
+        # New names can change the answer for earlier fuzzy misses
+        self.fuzzy_cache.clear()
+
+    def resolve(self, name):
+        """Return the canonical name for a team, or None if unknown"""
+        key = normalize_team_name(name)
+        if not key:
+            return None
+
+        canonical = self.index.get(key)
+        if canonical is not None:
+            return canonical
+
+        if key in self.fuzzy_cache:
+            return self.fuzzy_cache[key]
+
+        # Fuzzy fallback, resolved once per unseen spelling
+        candidates = get_close_matches(key, self.index.keys(), n=1, cutoff=self.fuzzy_cutoff)
+        canonical = self.index[candidates[0]] if candidates else None
+        self.fuzzy_cache[key] = canonical
+
+        return canonical
+
+    def canonical(self, name):
+        """Resolve a team name, falling back to the name itself"""
+        return self.resolve(name) or name
+
+
+class FixtureIndex:
+    """Lookup table from (home, away) canonical team pair to fixtures"""
+
+    def __init__(self, resolver, max_time_gap_hours=12):
+        self.resolver = resolver
+        self.max_time_gap_seconds = max_time_gap_hours * 3600
+        self.fixtures = {}
+
+    def _key(self, home_team, away_team):
+        return (self.resolver.canonical(home_team), self.resolver.canonical(away_team))
+
+    def add(self, match):
+        """Add a Match (or any object with team names and commence_time)"""
+        key = self._key(match.home_team, match.away_team)
+        self.fixtures.setdefault(key, []).append(match)
+
+    def build(self, matches):
+        """Index a batch of matches"""
+        for match in matches:
+            self.add(match)
+        return self
+
+    def lookup(self, home_team, away_team, commence_time=None):
+        """Find the indexed fixture for a feed record, or None"""
+        candidates = self.fixtures.get(self._key(home_team, away_team))
+        if not candidates:
+            return None
+
+        if commence_time is None:
+            return candidates[0]
+
+        def time_gap(match):
+            if match.commence_time is None:
+                return float('inf')
+            return abs((_naive_utc(match.commence_time) - _naive_utc(commence_time)).total_seconds())
+
+        best = min(candidates, key=time_gap)
+        if time_gap(best) > self.max_time_gap_seconds:
+            return None
+
+        return best
+
+    def __len__(self):
+        return sum(len(matches) for matches in self.fixtures.values())
+
+
+def _naive_utc(value):
+    """Drop tzinfo after converting to UTC so mixed datetimes compare"""
+    if value.tzinfo is not None:
+        value = (value - value.utcoffset()).replace(tzinfo=None)
+    return value
@@ -0,0 +1,132 @@
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import and_, false, func, or_, select, union_all
+from backend.database.models import db, Match, ArchivedMatch
+from backend.database.results import query_settled_results
+
+# Every shared column except the surrogate key, which each table owns
+ARCHIVE_COLUMNS = [column.name for column in Match.__table__.columns if column.name != 'id']
+# Matches without a settled result stay hot this long, so the score feed can still finish them
+UNSETTLED_WINDOW = timedelta(hours=24)
+
+
+class MatchArchiver:
+    def __init__(self, archive_after_hours=24, batch_size=500):
+        self.archive_after_hours = archive_after_hours
+        self.batch_size = batch_size
+
+    def archive_finished_matches(self, now=None):
+        """Move finished matches older than the retention window to the archive
+
+        Settled Final matches go once they pass the retention window. Anything
+        else waits for UNSETTLED_WINDOW too, so settle always sees a result
+        first; past that it is stale (dropped out of the feed mid-game) and its
+        is_live flag is cleared on the way out.
+        """
+        now = now or datetime.utcnow()
+        cutoff = now - timedelta(hours=self.archive_after_hours)
+        stale_cutoff = min(cutoff, now - UNSETTLED_WINDOW)
+        matches_table = Match.__table__
+        finished = or_(
+            and_(matches_table.c.commence_time < cutoff, matches_table.c.settled_at.isnot(None)),
+            and_(matches_table.c.commence_time < stale_cutoff,
+                 or_(matches_table.c.match_status.is_(None), matches_table.c.match_status != 'Final'))
+        )
+        archive_table = ArchivedMatch.__table__
+        # Copy every column as is, except the stale live flag
+        archive_select = [false().label(name) if name == 'is_live' else matches_table.c[name]
+                          for name in ARCHIVE_COLUMNS]
+        archived = 0
+
+        while True:
+            ids = [row[0] for row in db.session.execute(
+                select(matches_table.c.id)
+                .where(finished)
+                .order_by(matches_table.c.id)
+                .limit(self.batch_size)
+            )]
+            if not ids:
+                break
+
+            try:
+                db.session.execute(archive_table.insert().from_select(
+                    ARCHIVE_COLUMNS,
+                    select(*archive_select)
+                    .where(matches_table.c.id.in_(ids))
+                ))
+                db.session.execute(matches_table.delete().where(matches_table.c.id.in_(ids)))
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                print(f"Error archiving matches: {e}")
+                break
+
+            archived += len(ids)
+            if len(ids) < self.batch_size:
+                break
+
+        if archived:
+            print(f"Archived {archived} finished matches")
+        return archived
+
+    def history_query(self, sport=None, team=None):
+        """Select over hot and archived matches as one result set"""
+        selects = []
+        for table in (Match.__table__, ArchivedMatch.__table__):
+            query = select(*[table.c[name] for name in ARCHIVE_COLUMNS])
+            if sport and sport != 'all':
+                query = query.where(table.c.sport_key == sport)
+            if team:
+                query = query.where((table.c.home_team == team) | (table.c.away_team == team))
+            selects.append(query)
+
+        return union_all(*selects).subquery()
+
+    def get_historical_matches(self, sport=None, team=None, limit=100):
+        """Return matches from both tables, most recent first"""
+        history = self.history_query(sport, team)
+        rows = db.session.execute(
+            select(history).order_by(history.c.commence_time.desc()).limit(limit)
+        ).mappings()
+
+        return [_row_to_dict(row) for row in rows]
+
+    def settled_results(self):
+        """Final scores from hot and archived matches, oldest first"""
+        return query_settled_results(db.session.connection(), (Match.__table__, ArchivedMatch.__table__))
+
+    def table_stats(self, page_size=50, runs=5):
+        """Row counts, plus best-of-N latency of one page from the hot table vs. the UNION
+
+        The hot query is what /api/matches runs; the history query is what it
+        would cost if finished matches were never moved out.
+        """
+        hot_page = select(Match.__table__).order_by(Match.__table__.c.commence_time).limit(page_size)
+        history = self.history_query()
+        history_page = select(history).order_by(history.c.commence_time).limit(page_size)
+
+        return {
+            'hot_rows': db.session.query(func.count(Match.id)).scalar(),
+            'archived_rows': db.session.query(func.count(ArchivedMatch.id)).scalar(),
+            'page_size': page_size,
+            'hot_query_ms': _best_query_ms(hot_page, runs),
+            'history_query_ms': _best_query_ms(history_page, runs)
+        }
+
+
+def _best_query_ms(query, runs):
+    timings = []
+    for _ in range(max(runs, 1)):
+        started = time.perf_counter()
+        db.session.execute(query).fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    return round(min(timings), 2)
+
+
+def _row_to_dict(row):
+    result = dict(row)
+    if result.get('commence_time'):
+        result['commence_time'] = result['commence_time'].isoformat()
+    for name in ('created_at', 'updated_at'):
+        result.pop(name, None)
+    return result
@@ -3,8 +3,8 @@ from datetime import datetime
 
 db = SQLAlchemy()
 
-class Match(db.Model):
-    __tablename__ = 'matches'
+class MatchColumns:
+    """Columns shared by the hot matches table and its archive"""
     
     id = db.Column(db.Integer, primary_key=True)
     match_id = db.Column(db.String(100), unique=True, nullable=False)
@@ -12,7 +12,7 @@ class Match(db.Model):
     sport_title = db.Column(db.String(100), nullable=False)
     home_team = db.Column(db.String(200), nullable=False)
     away_team = db.Column(db.String(200), nullable=False)
-    commence_time = db.Column(db.DateTime, nullable=False)
+    commence_time = db.Column(db.DateTime, nullable=False, index=True)
     league = db.Column(db.String(150))
     
     # Odds data
@@ -34,6 +34,8 @@ class Match(db.Model):
     home_score = db.Column(db.Integer, default=0)
     away_score = db.Column(db.Integer, default=0)
     match_status = db.Column(db.String(50))
+    # Set once a Final result has been fed to team form and the model
+    settled_at = db.Column(db.DateTime)
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -63,3 +65,27 @@ class Match(db.Model):
             'away_score': self.away_score,
             'match_status': self.match_status
         }
+
+
+class Match(MatchColumns, db.Model):
+    __tablename__ = 'matches'
+
+
+class ArchivedMatch(MatchColumns, db.Model):
+    __tablename__ = 'archived_matches'
+    
+    # The same fixture id may come back from the API after it was archived
+    match_id = db.Column(db.String(100), nullable=False, index=True)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+def add_missing_columns():
+    """Add columns introduced after a table was created; create_all never alters tables"""
+    inspector = db.inspect(db.engine)
+    for table in (Match.__table__, ArchivedMatch.__table__):
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                column_type = column.type.compile(dialect=db.engine.dialect)
+                db.session.execute(db.text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+    db.session.commit()
@@ -0,0 +1,50 @@
+"""Settled results read with plain SQLAlchemy, so training needn't load Flask"""
+import os
+from sqlalchemy import MetaData, Table, create_engine, inspect, select, union_all
+from sqlalchemy.engine import make_url
+
+MATCH_TABLES = ('matches', 'archived_matches')
+# Flask-SQLAlchemy resolves relative SQLite paths against the app's instance folder
+INSTANCE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                             'instance')
+
+
+def query_settled_results(connection, tables):
+    """Final scores from the given match tables, oldest first"""
+    history = union_all(*[
+        select(table.c.home_team, table.c.away_team, table.c.home_score,
+               table.c.away_score, table.c.commence_time)
+        .where(table.c.match_status == 'Final')
+        for table in tables
+    ]).subquery()
+    rows = connection.execute(select(history).order_by(history.c.commence_time))
+
+    return [{
+        'home_team': row.home_team,
+        'away_team': row.away_team,
+        'home_goals': row.home_score or 0,
+        'away_goals': row.away_score or 0,
+        'played_at': row.commence_time
+    } for row in rows]
+
+
+def load_settled_results(database_url):
+    """query_settled_results over the app's database URL, without an app context"""
+    engine = create_engine(_resolve_url(database_url))
+    try:
+        with engine.connect() as connection:
+            existing = set(inspect(connection).get_table_names())
+            metadata = MetaData()
+            tables = [Table(name, metadata, autoload_with=connection)
+                      for name in MATCH_TABLES if name in existing]
+            return query_settled_results(connection, tables) if tables else []
+    finally:
+        engine.dispose()
+
+
+def _resolve_url(database_url):
+    url = make_url(database_url)
+    if url.get_backend_name() == 'sqlite' and url.database and url.database != ':memory:' \
+            and not os.path.isabs(url.database):
+        url = url.set(database=os.path.join(INSTANCE_PATH, url.database))
+    return url
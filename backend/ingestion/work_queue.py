@@ -0,0 +1,194 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+
+
+class Job:
+    def __init__(self, job_id, kind, payload, shard, attempts=0):
+        self.id = job_id
+        self.kind = kind
+        self.payload = payload
+        self.shard = shard
+        self.attempts = attempts
+
+
+class WorkQueue(ABC):
+    """Sharded job queue: producers put jobs on a shard, that shard's worker leases them"""
+
+    @abstractmethod
+    def put(self, kind, payload, shard=0):
+        """Enqueue a job unless an identical one is already waiting or running"""
+
+    @abstractmethod
+    def lease(self, shard, lease_seconds=300):
+        """Take the next job for a shard, or None; unacked jobs return after the lease"""
+
+    @abstractmethod
+    def ack(self, job):
+        """Remove a finished job"""
+
+    @abstractmethod
+    def fail(self, job, max_attempts=3):
+        """Requeue a failed job, or park it once it has used all attempts"""
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """Queue in a local SQLite file, shared by processes on one machine"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # One connection per process and thread; sqlite3 connections can't be shared
+        self.local = threading.local()
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    shard INTEGER NOT NULL,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    lease_until REAL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_shard_status ON jobs (shard, status, id)")
+
+    def _connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None or getattr(self.local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self.local.conn = conn
+            self.local.pid = os.getpid()
+        return _Transaction(conn)
+
+    def put(self, kind, payload, shard=0):
+        encoded = json.dumps(payload, sort_keys=True)
+        with self._connection() as conn:
+            pending = conn.execute(
+                "SELECT 1 FROM jobs WHERE shard = ? AND kind = ? AND payload = ? "
+                "AND status IN ('queued', 'leased')",
+                (shard, kind, encoded)
+            ).fetchone()
+            if pending:
+                return False
+            conn.execute(
+                "INSERT INTO jobs (shard, kind, payload, created_at) VALUES (?, ?, ?, ?)",
+                (shard, kind, encoded, time.time())
+            )
+            return True
+
+    def lease(self, shard, lease_seconds=300):
+        now = time.time()
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT id, kind, payload, attempts FROM jobs WHERE shard = ? AND "
+                "(status = 'queued' OR (status = 'leased' AND lease_until < ?)) ORDER BY id LIMIT 1",
+                (shard, now)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'leased', lease_until = ?, attempts = attempts + 1 WHERE id = ?",
+                (now + lease_seconds, row[0])
+            )
+        return Job(row[0], row[1], json.loads(row[2]), shard, row[3] + 1)
+
+    def ack(self, job):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM jobs WHERE id = ?", (job.id,))
+
+    def fail(self, job, max_attempts=3):
+        status = 'failed' if job.attempts >= max_attempts else 'queued'
+        with self._connection() as conn:
+            conn.execute("UPDATE jobs SET status = ?, lease_until = NULL WHERE id = ?", (status, job.id))
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE / COMMIT around a block, so leases never race"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+        return False
+
+
+class MemoryWorkQueue(WorkQueue):
+    """In-process queue for a single process (tests, embedding); not shared with workers"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.queues = {}
+        self.leased = {}
+        self.next_id = 1
+
+    def put(self, kind, payload, shard=0):
+        with self.lock:
+            queue = self.queues.setdefault(shard, deque())
+            leased = [job for job, _ in self.leased.values() if job.shard == shard]
+            if any(job.kind == kind and job.payload == payload for job in [*queue, *leased]):
+                return False
+            queue.append(Job(self.next_id, kind, payload, shard))
+            self.next_id += 1
+            return True
+
+    def lease(self, shard, lease_seconds=300):
+        with self.lock:
+            now = time.time()
+            for job_id, (job, lease_until) in list(self.leased.items()):
+                if job.shard == shard and lease_until < now:
+                    del self.leased[job_id]
+                    self.queues.setdefault(shard, deque()).appendleft(job)
+            queue = self.queues.get(shard)
+            if not queue:
+                return None
+            job = queue.popleft()
+            job.attempts += 1
+            self.leased[job.id] = (job, now + lease_seconds)
+            return job
+
+    def ack(self, job):
+        with self.lock:
+            self.leased.pop(job.id, None)
+
+    def fail(self, job, max_attempts=3):
+        with self.lock:
+            self.leased.pop(job.id, None)
+            if job.attempts < max_attempts:
+                self.queues.setdefault(job.shard, deque()).append(job)
+
+
+# Backends by URL scheme; register_work_queue adds alternatives (e.g. Redis)
+WORK_QUEUE_BACKENDS = {
+    # Same convention as SQLAlchemy: sqlite:///relative.db, sqlite:////absolute.db
+    'sqlite': lambda location: SQLiteWorkQueue(location[1:]),
+    'memory': lambda location: MemoryWorkQueue(),
+}
+
+
+def register_work_queue(scheme, factory):
+    """Make create_work_queue accept '<scheme>://...' URLs"""
+    WORK_QUEUE_BACKENDS[scheme] = factory
+
+
+def create_work_queue(url):
+    """Build a queue from a URL such as sqlite:///ingestion_queue.db or memory://"""
+    scheme, _, location = url.partition('://')
+    factory = WORK_QUEUE_BACKENDS.get(scheme)
+    if factory is None:
+        raise ValueError(f"Unknown work queue backend: {scheme}")
+    return factory(location)
@@ -0,0 +1,175 @@
+"""Standalone ingestion: a coordinator process plus N workers, each owning a shard of sports.
+
+    python -m backend.ingestion.worker --processes 4 --sports soccer_epl,soccer_spain_la_liga
+
+Run the web process with INGESTION_MODE=workers so it only serves reads.
+"""
+import argparse
+import multiprocessing
+import signal
+import time
+
+import schedule
+
+from config.settings import Config
+from backend.ingestion.work_queue import create_work_queue
+from backend.api_integration.polling_planner import PollingPlanner
+
+# Jobs that touch every sport run on shard 0
+MAINTENANCE_SHARD = 0
+
+
+def assign_shards(sports, n_shards):
+    """Deal sorted sports round-robin, so shard sizes differ by at most one
+
+    Depends only on the sport list and shard count, so every process
+    computes the same owners.
+    """
+    shards = {}
+    for i, sport in enumerate(sorted(set(sports))):
+        shards.setdefault(i % n_shards, []).append(sport)
+    return shards
+
+
+def prepare_shared_state():
+    """One-off setup before any worker starts, so workers never race to do it
+
+    Workers then load the saved model and team form, and reload them
+    whenever the settle job (shard 0) saves new versions.
+    """
+    from app import init_database, prepare_prediction_state
+    init_database()
+    prepare_prediction_state()
+
+
+def run_worker(shard, queue_url, poll_interval=1.0, lease_seconds=300):
+    """Worker process loop: lease jobs for one shard and run them"""
+    # Imported here so the coordinator never loads Flask, pandas or sklearn
+    from app import (app, fetch_and_process_matches, update_live_scores,
+                     settle_finished_matches, archive_finished_matches)
+
+    handlers = {
+        'odds': lambda payload: fetch_and_process_matches(payload['sports']),
+        'live_scores': lambda payload: update_live_scores(),
+        'settle': lambda payload: settle_finished_matches(),
+        'archive': lambda payload: archive_finished_matches(),
+    }
+
+    queue = create_work_queue(queue_url)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    print(f"Ingestion worker {shard} started")
+
+    while True:
+        job = queue.lease(shard, lease_seconds)
+        if job is None:
+            time.sleep(poll_interval)
+            continue
+
+        try:
+            started = time.perf_counter()
+            with app.app_context():
+                handlers[job.kind](job.payload)
+            queue.ack(job)
+            print(f"Worker {shard}: {job.kind} {job.payload} in {time.perf_counter() - started:.2f}s")
+        except Exception as e:
+            print(f"Worker {shard}: {job.kind} failed (attempt {job.attempts}): {e}")
+            queue.fail(job)
+
+
+class IngestionCoordinator:
+    """Schedules jobs onto shards and keeps the worker processes alive"""
+
+    def __init__(self, processes, sports, queue_url):
+        self.processes = processes
+        self.queue_url = queue_url
+        self.queue = create_work_queue(queue_url)
+        self.shards = assign_shards(sports, processes)
+        self.sports = sports
+        # Workers record quota headers in the shared state file; this reads them
+        self.planner = PollingPlanner(Config.ODDS_API_MONTHLY_QUOTA, state_file=Config.POLLING_STATE_FILE)
+        self.workers = {}
+        self.running = True
+
+    def enqueue_odds(self):
+        # One job per shard, listing the due sports that shard owns
+        due = set(self.planner.due_sports(self.sports))
+        for shard, sports in self.shards.items():
+            shard_due = [sport for sport in sports if sport in due]
+            if shard_due:
+                self.queue.put('odds', {'sports': shard_due}, shard)
+                # Not due again until a worker has polled them (or the request times out)
+                self.planner.mark_requested(shard_due)
+
+    def enqueue(self, kind):
+        self.queue.put(kind, {}, MAINTENANCE_SHARD)
+
+    def start_worker(self, shard):
+        process = multiprocessing.Process(
+            target=run_worker, args=(shard, self.queue_url), name=f"ingestion-{shard}", daemon=True
+        )
+        process.start()
+        self.workers[shard] = process
+
+    def stop(self, *args):
+        self.running = False
+
+    def prepare(self):
+        # In a child process too, so the coordinator never loads Flask
+        setup = multiprocessing.Process(target=prepare_shared_state, name='ingestion-setup')
+        setup.start()
+        setup.join()
+        if setup.exitcode != 0:
+            raise SystemExit(f"Ingestion setup failed with exit code {setup.exitcode}")
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        # Schema creation and first training are not safe to run from every worker at once
+        self.prepare()
+        for shard in range(self.processes):
+            self.start_worker(shard)
+        for shard, sports in sorted(self.shards.items()):
+            print(f"Shard {shard}: {', '.join(sports)}")
+
+        schedule.every(Config.POLLING_CHECK_INTERVAL).seconds.do(self.enqueue_odds)
+        schedule.every(1).minutes.do(self.enqueue, 'live_scores')
+        schedule.every(5).minutes.do(self.enqueue, 'settle')
+        schedule.every(Config.ARCHIVE_INTERVAL).seconds.do(self.enqueue, 'archive')
+        self.enqueue_odds()
+
+        try:
+            while self.running:
+                schedule.run_pending()
+                for shard, process in list(self.workers.items()):
+                    if not process.is_alive():
+                        print(f"Worker {shard} exited with {process.exitcode}, restarting")
+                        self.start_worker(shard)
+                time.sleep(1)
+        finally:
+            for process in self.workers.values():
+                process.terminate()
+            for process in self.workers.values():
+                process.join(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run sharded ingestion workers')
+    parser.add_argument('--processes', type=int, default=2, help='number of worker processes')
+    parser.add_argument('--sports', default=','.join(Config.INGESTION_SPORTS),
+                        help='comma-separated sport keys to ingest')
+    parser.add_argument('--queue', default=Config.INGESTION_QUEUE_URL,
+                        help='work queue URL (sqlite:///path.db, or a registered backend)')
+    args = parser.parse_args()
+
+    if args.queue.partition('://')[0] == 'memory':
+        # Every process would get its own empty queue
+        parser.error('memory:// queues cannot be shared between processes; use sqlite:// or a '
+                     'registered backend')
+
+    sports = [sport for sport in args.sports.split(',') if sport]
+    IngestionCoordinator(max(1, args.processes), sports, args.queue).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+import copy
+import os
+import threading
+import time
+import joblib
+import numpy as np
+
+OUTCOMES = np.array(['away', 'draw', 'home'])
+
+
+class OnlineLearner:
+    """Mini-batch partial_fit updates for a PredictionEngine, swapped in atomically"""
+
+    def __init__(self, prediction_engine, batch_size=64, max_batches_per_update=8, pending_path=None):
+        self.engine = prediction_engine
+        self.batch_size = batch_size
+        self.max_batches_per_update = max_batches_per_update
+        # Queued results survive restarts and are shared by every worker process
+        self.pending_path = pending_path
+        self.pending_mtime = None
+        # Entries are dicts with key, seq, features and outcome; seq orders them
+        # and the model file records the last seq it learned
+        self.pending = []
+        self.next_seq = 1
+        self.update_lock = threading.Lock()
+        self.samples_seen = 0
+
+    def submit(self, results):
+        """Queue settled results (dicts with match_id, teams, league, odds and outcome)
+
+        Features are built now, so form features reflect the teams before
+        the result is recorded in the feature store. A result already queued
+        is skipped, so resubmitting after a crash doesn't learn it twice.
+        """
+        with self.update_lock:
+            self._load_pending()
+            queued = {entry['key'] for entry in self.pending}
+            for r in results:
+                if r.get('match_id') in queued:
+                    continue
+                if r.get('outcome') in OUTCOMES and all(
+                    r.get(key) for key in ('home_odds', 'away_odds', 'draw_odds')
+                ):
+                    features = self.engine.build_features(
+                        r['home_team'], r['away_team'], r.get('league', 'Unknown'),
+                        r['home_odds'], r['away_odds'], r['draw_odds'], r.get('played_at')
+                    )
+                    self.pending.append({'key': r.get('match_id'), 'seq': self.next_seq,
+                                         'features': features, 'outcome': r['outcome']})
+                    queued.add(r.get('match_id'))
+                    self.next_seq += 1
+            self._save_pending()
+
+    def update(self):
+        """Learn from up to max_batches_per_update mini-batches of pending results"""
+        with self.update_lock:
+            self.engine.ensure_trained()
+            self._load_pending()
+            # Drop anything a saved model already learned (a crash after the
+            # model was written but before the queue was)
+            self.pending = [entry for entry in self.pending if entry['seq'] > self.engine.learned_seq]
+            if not self.pending:
+                return 0
+
+            model, scaler, team_codes, league_codes = self.engine.snapshot
+            if model is None or not hasattr(model, 'partial_fit'):
+                print("Online learning needs a partial_fit model (PREDICTION_MODEL=sgd)")
+                return 0
+
+            started = time.perf_counter()
+            limit = self.batch_size * self.max_batches_per_update
+            batch = self.pending[:limit]
+
+            X = np.array([entry['features'] for entry in batch], dtype=float)
+            y = np.array([entry['outcome'] for entry in batch])
+
+            # Train a copy so predictions never see a half-updated model. The
+            # scaler stays fixed: rescaling would invalidate the learned weights.
+            new_model = copy.deepcopy(model)
+            X_scaled = scaler.transform(X)
+            for start in range(0, len(batch), self.batch_size):
+                end = start + self.batch_size
+                new_model.partial_fit(X_scaled[start:end], y[start:end], classes=OUTCOMES)
+
+            self.engine.swap_model(new_model, scaler, team_codes, league_codes)
+            self.engine.learned_seq = batch[-1]['seq']
+            self.engine.save_model()
+            self.pending = self.pending[len(batch):]
+            self._save_pending()
+            self.samples_seen += len(batch)
+
+            print(f"Online update: {len(batch)} results in {(time.perf_counter() - started) * 1000:.1f} ms, "
+                  f"{len(self.pending)} pending")
+            return len(batch)
+
+    def _load_pending(self):
+        """Re-read the queue if another process changed it"""
+        if not self.pending_path:
+            return
+        try:
+            mtime = os.stat(self.pending_path).st_mtime_ns
+            if mtime == self.pending_mtime:
+                return
+            saved = joblib.load(self.pending_path)
+        except Exception as e:
+            if os.path.exists(self.pending_path):
+                print(f"Error loading pending results: {e}")
+            return
+        self.pending = saved['pending']
+        self.next_seq = saved['next_seq']
+        self.pending_mtime = mtime
+
+    def _save_pending(self):
+        """Write the queue, replacing the old file atomically"""
+        if not self.pending_path:
+            return
+        directory = os.path.dirname(self.pending_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.pending_path}.{os.getpid()}.tmp"
+        joblib.dump({'pending': self.pending, 'next_seq': self.next_seq}, temp_path)
+        os.replace(temp_path, self.pending_path)
+        self.pending_mtime = os.stat(self.pending_path).st_mtime_ns
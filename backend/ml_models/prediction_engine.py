@@ -1,23 +1,47 @@
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.preprocessing import StandardScaler
 import joblib
 import os
+import threading
+from backend.data_processing.feature_store import FORM_FEATURES
+
+# Column order of predict_probabilities
+OUTCOME_COLUMNS = ('home', 'draw', 'away')
+
+FEATURES = ['home_team_encoded', 'away_team_encoded', 'league_encoded',
+            'home_odds', 'away_odds', 'draw_odds', 'home_strength', 'away_strength']
 
 class PredictionEngine:
-    def __init__(self):
+    def __init__(self, model_type='random_forest', feature_store=None,
+                 model_path='backend/ml_models/saved_models/prediction_model.joblib'):
+        self.model_type = model_type
+        self.feature_store = feature_store
         self.model = None
         self.scaler = StandardScaler()
-        self.team_encoder = LabelEncoder()
-        self.league_encoder = LabelEncoder()
-        self.model_path = 'backend/ml_models/saved_models/prediction_model.joblib'
+        # Name -> code maps; append-only, so a code never changes under learned weights
+        self.team_codes = {}
+        self.league_codes = {}
+        self.encoder_lock = threading.Lock()
+        self.model_path = model_path
         self.is_trained = False
+        # mtime of the saved model this process last loaded or wrote
+        self.model_mtime = None
+        # Sequence number of the last online-learning result in the model
+        self.learned_seq = 0
+        # Only one thread loads or trains; the rest wait for its result
+        self.load_lock = threading.Lock()
+        # (model, scaler, team_codes, league_codes) read together by predictions;
+        # replaced as a whole, and the code maps only ever grow
+        self.snapshot = (None, self.scaler, self.team_codes, self.league_codes)
         
     def create_synthetic_training_data(self):
         """Create synthetic training data for demonstration"""
-        np.random.seed(42)
+        # Own generator, so concurrent callers can't disturb the sequence
+        rng = np.random.RandomState(42)
         
         teams = ['Arsenal', 'Chelsea', 'Liverpool', 'Man City', 'Man United', 
                 'Tottenham', 'Newcastle', 'Brighton', 'West Ham', 'Crystal Palace']
@@ -26,13 +50,13 @@ class PredictionEngine:
         
         data = []
         for _ in range(1000):
-            home_team = np.random.choice(teams)
-            away_team = np.random.choice([t for t in teams if t != home_team])
-            league = np.random.choice(leagues)
+            home_team = rng.choice(teams)
+            away_team = rng.choice([t for t in teams if t != home_team])
+            league = rng.choice(leagues)
             
             # Simulate some realistic features
-            home_strength = np.random.normal(0.5, 0.2)
-            away_strength = np.random.normal(0.5, 0.2)
+            home_strength = rng.normal(0.5, 0.2)
+            away_strength = rng.normal(0.5, 0.2)
             
             # Home advantage
             home_advantage = 0.1
@@ -49,7 +73,7 @@ class PredictionEngine:
             draw_prob /= total
             
             # Determine outcome based on probabilities
-            outcome = np.random.choice(['home', 'away', 'draw'], p=[home_prob, away_prob, draw_prob])
+            outcome = rng.choice(['home', 'away', 'draw'], p=[home_prob, away_prob, draw_prob])
             
             # Odds based on probabilities with some bookmaker margin
             margin = 1.05  # 5% margin
@@ -71,6 +95,31 @@ class PredictionEngine:
         
         return pd.DataFrame(data)
     
+    def add_synthetic_results(self, df):
+        """Add scores and kickoff times consistent with each outcome
+
+        No xG columns: serving has no xG source and records goals as xG, so
+        training does the same (rolling_features falls back to goals).
+        """
+        rng = np.random.default_rng(42)
+        n = len(df)
+        
+        loser_goals = rng.poisson(0.8, n)
+        winner_goals = loser_goals + 1 + rng.poisson(0.6, n)
+        draw_goals = rng.poisson(1.1, n)
+        
+        home_win = (df['outcome'] == 'home').to_numpy()
+        away_win = (df['outcome'] == 'away').to_numpy()
+        df['home_goals'] = np.select([home_win, away_win], [winner_goals, loser_goals], draw_goals)
+        df['away_goals'] = np.select([home_win, away_win], [loser_goals, winner_goals], draw_goals)
+        df['played_at'] = pd.Timestamp('2023-08-01') + pd.to_timedelta(np.arange(n) * 12, unit='h')
+        
+        return df
+    
+    def feature_names(self):
+        """Model input columns, including form features when a store is attached"""
+        return FEATURES + FORM_FEATURES if self.feature_store else FEATURES
+    
     def train_model(self):
         """Train the prediction model"""
         print("Training prediction model...")
@@ -79,55 +128,104 @@ class PredictionEngine:
         df = self.create_synthetic_training_data()
         
         # Encode categorical variables
-        df['home_team_encoded'] = self.team_encoder.fit_transform(df['home_team'])
-        df['away_team_encoded'] = self.team_encoder.transform(df['away_team'])
-        df['league_encoded'] = self.league_encoder.fit_transform(df['league'])
+        team_codes = encode_names(set(df['home_team']) | set(df['away_team']))
+        league_codes = encode_names(set(df['league']))
+        df['home_team_encoded'] = df['home_team'].map(team_codes)
+        df['away_team_encoded'] = df['away_team'].map(team_codes)
+        df['league_encoded'] = df['league'].map(league_codes)
+        
+        if self.feature_store:
+            # Pre-match form for the synthetic rows; the store's serving state
+            # is left alone, since it comes from real settled results
+            df = self.add_synthetic_results(df)
+            df = df.join(self.feature_store.rolling_features(df))
         
         # Prepare features and target
-        features = ['home_team_encoded', 'away_team_encoded', 'league_encoded', 
-                   'home_odds', 'away_odds', 'draw_odds', 'home_strength', 'away_strength']
-        X = df[features]
+        X = df[self.feature_names()]
         y = df['outcome']
         
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
         
         # Scale features
-        X_train_scaled = self.scaler.fit_transform(X_train)
+        scaler = StandardScaler()
+        X_train_scaled = scaler.fit_transform(X_train)
         
         # Train model
-        self.model = RandomForestClassifier(n_estimators=100, random_state=42)
-        self.model.fit(X_train_scaled, y_train)
+        model = self._create_model()
+        model.fit(X_train_scaled, y_train)
         
         # Calculate training accuracy
-        train_accuracy = self.model.score(X_train_scaled, y_train)
-        X_test_scaled = self.scaler.transform(X_test)
-        test_accuracy = self.model.score(X_test_scaled, y_test)
+        train_accuracy = model.score(X_train_scaled, y_train)
+        X_test_scaled = scaler.transform(X_test)
+        test_accuracy = model.score(X_test_scaled, y_test)
         
         print(f"Model trained - Train Accuracy: {train_accuracy:.3f}, Test Accuracy: {test_accuracy:.3f}")
         
-        # Save model
-        os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
-        joblib.dump({
-            'model': self.model,
-            'scaler': self.scaler,
-            'team_encoder': self.team_encoder,
-            'league_encoder': self.league_encoder
-        }, self.model_path)
+        self.swap_model(model, scaler, team_codes, league_codes)
+        self.save_model()
         
-        self.is_trained = True
         return True
     
+    def _create_model(self):
+        """Build an untrained estimator for the configured model type"""
+        if self.model_type == 'sgd':
+            # Supports partial_fit, so settled results can be learned online
+            return SGDClassifier(loss='log_loss', alpha=1e-4, random_state=42)
+        return RandomForestClassifier(n_estimators=100, random_state=42)
+    
+    def swap_model(self, model, scaler, team_codes=None, league_codes=None):
+        """Atomically publish a new model; in-flight predictions keep the old one
+
+        Code maps default to the current ones, for a model trained on them.
+        """
+        _, _, current_team_codes, current_league_codes = self.snapshot
+        self.team_codes = current_team_codes if team_codes is None else team_codes
+        self.league_codes = current_league_codes if league_codes is None else league_codes
+        self.snapshot = (model, scaler, self.team_codes, self.league_codes)
+        self.model = model
+        self.scaler = scaler
+        self.is_trained = True
+    
+    def save_model(self):
+        """Persist the current model and code maps, replacing the old file atomically"""
+        model, scaler, team_codes, league_codes = self.snapshot
+        with self.encoder_lock:
+            # Copies, so a request thread adding a team can't change them mid-dump
+            team_codes, league_codes = dict(team_codes), dict(league_codes)
+        os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
+        temp_path = f"{self.model_path}.{os.getpid()}.tmp"
+        joblib.dump({
+            'model': model,
+            'scaler': scaler,
+            'team_codes': team_codes,
+            'league_codes': league_codes,
+            'learned_seq': self.learned_seq
+        }, temp_path)
+        os.replace(temp_path, self.model_path)
+        self.model_mtime = self._saved_mtime()
+    
+    def _saved_mtime(self):
+        try:
+            return os.stat(self.model_path).st_mtime_ns
+        except OSError:
+            return None
+    
     def load_model(self):
         """Load trained model"""
         try:
             if os.path.exists(self.model_path):
+                # Recorded even if the file is rejected, so it isn't re-read on every call
+                self.model_mtime = self._saved_mtime()
                 saved_data = joblib.load(self.model_path)
-                self.model = saved_data['model']
-                self.scaler = saved_data['scaler']
-                self.team_encoder = saved_data['team_encoder']
-                self.league_encoder = saved_data['league_encoder']
-                self.is_trained = True
+                if type(saved_data['model']) is not type(self._create_model()) or \
+                        saved_data['scaler'].n_features_in_ != len(self.feature_names()) or \
+                        'team_codes' not in saved_data:
+                    print("Saved model differs from configuration, retraining")
+                    return False
+                self.swap_model(saved_data['model'], saved_data['scaler'],
+                                saved_data['team_codes'], saved_data['league_codes'])
+                self.learned_seq = saved_data.get('learned_seq', 0)
                 print("Model loaded successfully")
                 return True
         except Exception as e:
@@ -135,40 +233,33 @@ class PredictionEngine:
         
         return False
     
-    def predict_match(self, home_team, away_team, league, home_odds, away_odds, draw_odds):
+    def predict_match(self, home_team, away_team, league, home_odds, away_odds, draw_odds, kickoff=None):
         """Predict match outcome"""
-        if not self.is_trained:
-            if not self.load_model():
-                self.train_model()
+        self.ensure_trained()
         
         try:
-            # Prepare features
-            home_team_encoded = self._encode_team(home_team)
-            away_team_encoded = self._encode_team(away_team)
-            league_encoded = self._encode_league(league)
-            
-            # Estimate team strengths based on odds
-            home_strength = 1 / home_odds if home_odds else 0.3
-            away_strength = 1 / away_odds if away_odds else 0.3
-            
-            features = np.array([[home_team_encoded, away_team_encoded, league_encoded,
-                                home_odds, away_odds, draw_odds, home_strength, away_strength]])
+            snapshot = self.snapshot
+            model, scaler = snapshot[:2]
+            features = np.array([self.build_features(
+                home_team, away_team, league, home_odds, away_odds, draw_odds, kickoff, snapshot
+            )])
             
             # Scale features and predict
-            features_scaled = self.scaler.transform(features)
-            probabilities = self.model.predict_proba(features_scaled)[0]
-            prediction = self.model.predict(features_scaled)[0]
+            features_scaled = scaler.transform(features)
+            fallback = [self._fallback_probabilities(
+                {'home_odds': home_odds, 'away_odds': away_odds, 'draw_odds': draw_odds}
+            )]
+            row = outcome_matrix(model.predict_proba(features_scaled), model.classes_, fallback)[0]
             
-            # Map prediction to outcome
-            class_mapping = {0: 'home', 1: 'away', 2: 'draw'}
-            predicted_outcome = class_mapping.get(np.argmax(probabilities), 'draw')
+            home_prob, draw_prob, away_prob = (float(p) for p in row)
+            predicted_outcome = OUTCOME_COLUMNS[int(np.argmax(row))]
             
             return {
                 'predicted_winner': predicted_outcome,
-                'home_win_probability': float(probabilities[0]),
-                'away_win_probability': float(probabilities[1]),
-                'draw_probability': float(probabilities[2]),
-                'confidence': float(np.max(probabilities))
+                'home_win_probability': home_prob,
+                'away_win_probability': away_prob,
+                'draw_probability': draw_prob,
+                'confidence': max(home_prob, away_prob, draw_prob)
             }
             
         except Exception as e:
@@ -176,27 +267,107 @@ class PredictionEngine:
             # Fallback prediction based on odds
             return self._fallback_prediction(home_odds, away_odds, draw_odds)
     
-    def _encode_team(self, team_name):
-        """Encode team name, adding new teams if necessary"""
-        try:
-            return self.team_encoder.transform([team_name])[0]
-        except ValueError:
-            # Team not in training data, add it
-            all_teams = list(self.team_encoder.classes_)
-            all_teams.append(team_name)
-            self.team_encoder.fit(all_teams)
-            return self.team_encoder.transform([team_name])[0]
-    
-    def _encode_league(self, league_name):
-        """Encode league name, adding new leagues if necessary"""
-        try:
-            return self.league_encoder.transform([league_name])[0]
-        except ValueError:
-            # League not in training data, add it
-            all_leagues = list(self.league_encoder.classes_)
-            all_leagues.append(league_name)
-            self.league_encoder.fit(all_leagues)
-            return self.league_encoder.transform([league_name])[0]
+    def predict_probabilities(self, fixtures):
+        """(home, draw, away) probability matrix for many fixtures in one model call
+
+        Like predict_match, a fixture falls back to its odds when the model
+        can't score it, and outcomes the model never saw come from the odds.
+        """
+        self.ensure_trained()
+        
+        snapshot = self.snapshot
+        probabilities = np.empty((len(fixtures), 3))
+        rows, row_positions, form_keys = [], [], []
+        for i, fixture in enumerate(fixtures):
+            odds = (fixture.get('home_odds'), fixture.get('away_odds'), fixture.get('draw_odds'))
+            if all(odds):
+                try:
+                    rows.append(self._base_features(
+                        fixture['home_team'], fixture['away_team'], fixture.get('league', 'Unknown'),
+                        *odds, snapshot
+                    ))
+                    row_positions.append(i)
+                    form_keys.append((fixture['home_team'], fixture['away_team'], fixture.get('commence_time')))
+                    continue
+                except Exception as e:
+                    print(f"Prediction error: {e}")
+            probabilities[i] = self._fallback_probabilities(fixture)
+        
+        if rows:
+            model, scaler = snapshot[:2]
+            try:
+                X = np.array(rows, dtype=float)
+                if self.feature_store:
+                    X = np.hstack([X, self.feature_store.get_batch_features(form_keys)])
+                fallback = [self._fallback_probabilities(fixtures[i]) for i in row_positions]
+                probabilities[row_positions] = outcome_matrix(
+                    model.predict_proba(scaler.transform(X)), model.classes_, fallback
+                )
+            except Exception as e:
+                print(f"Prediction error: {e}")
+                for i in row_positions:
+                    probabilities[i] = self._fallback_probabilities(fixtures[i])
+        
+        return probabilities
+    
+    def _fallback_probabilities(self, fixture):
+        """Odds-based (home, draw, away) row for one fixture"""
+        fallback = self._fallback_prediction(
+            fixture.get('home_odds'), fixture.get('away_odds'), fixture.get('draw_odds')
+        )
+        return [fallback['home_win_probability'], fallback['draw_probability'],
+                fallback['away_win_probability']]
+    
+    def ensure_trained(self):
+        """Load the saved model, or train one if there is none
+
+        Also picks up a model or team form saved by another process since
+        the last call; when nothing changed this is one stat per file.
+        """
+        if self.feature_store:
+            self.feature_store.load()
+        if self.is_trained and self._saved_mtime() == self.model_mtime:
+            return
+        
+        with self.load_lock:
+            # Another thread may have loaded or trained while this one waited
+            if self.is_trained and self._saved_mtime() == self.model_mtime:
+                return
+            if not self.load_model() and not self.is_trained:
+                self.train_model()
+    
+    def build_features(self, home_team, away_team, league, home_odds, away_odds, draw_odds,
+                       kickoff=None, snapshot=None):
+        """Feature row in feature_names() order, encoded with the snapshot's code maps"""
+        features = self._base_features(home_team, away_team, league, home_odds, away_odds, draw_odds, snapshot)
+        
+        if self.feature_store:
+            # Precomputed per team, so this is two dict lookups
+            features.extend(self.feature_store.get_fixture_features(home_team, away_team, kickoff))
+        
+        return features
+    
+    def _base_features(self, home_team, away_team, league, home_odds, away_odds, draw_odds, snapshot=None):
+        """FEATURES part of a row: encoded names, odds and odds-implied strength"""
+        _, _, team_codes, league_codes = snapshot or self.snapshot
+        home_team_encoded = self._encode(team_codes, home_team)
+        away_team_encoded = self._encode(team_codes, away_team)
+        league_encoded = self._encode(league_codes, league)
+        
+        # Estimate team strengths based on odds
+        home_strength = 1 / home_odds if home_odds else 0.3
+        away_strength = 1 / away_odds if away_odds else 0.3
+        
+        return [home_team_encoded, away_team_encoded, league_encoded,
+                home_odds, away_odds, draw_odds, home_strength, away_strength]
+    
+    def _encode(self, codes, name):
+        """Code for a team or league name; unseen names get the next free code"""
+        code = codes.get(name)
+        if code is None:
+            with self.encoder_lock:
+                code = codes.setdefault(name, len(codes))
+        return code
     
     def _fallback_prediction(self, home_odds, away_odds, draw_odds):
         """Fallback prediction based on odds"""
@@ -233,3 +404,29 @@ class PredictionEngine:
             'draw_probability': float(draw_prob),
             'confidence': float(max_prob)
         }
+
+
+def encode_names(names):
+    """Name -> code map in sorted order, matching what LabelEncoder assigned"""
+    return {name: code for code, name in enumerate(sorted(names))}
+
+
+def outcome_matrix(predicted, classes, fallback):
+    """predict_proba output as OUTCOME_COLUMNS, one row per fixture
+
+    An outcome the model never saw (the synthetic training data has no
+    draws) takes its odds-implied probability from fallback, and the model's
+    probabilities are scaled to share what is left.
+    """
+    classes = list(classes)
+    predicted = np.asarray(predicted, dtype=float)
+    fallback = np.asarray(fallback, dtype=float)
+    matrix = np.zeros((len(predicted), len(OUTCOME_COLUMNS)))
+    missing = [column for column, outcome in enumerate(OUTCOME_COLUMNS) if outcome not in classes]
+    for column, outcome in enumerate(OUTCOME_COLUMNS):
+        if outcome in classes:
+            matrix[:, column] = predicted[:, classes.index(outcome)]
+    if missing:
+        matrix *= 1 - fallback[:, missing].sum(axis=1, keepdims=True)
+        matrix[:, missing] = fallback[:, missing]
+    return matrix
@@ -0,0 +1,50 @@
+import threading
+from config.settings import Config
+
+# ML components are built on first use, so processes that only serve reads
+# never import numpy, pandas, scikit-learn or joblib
+_lock = threading.RLock()
+_components = {}
+
+
+def _get(name, factory):
+    component = _components.get(name)
+    if component is None:
+        with _lock:
+            component = _components.get(name)
+            if component is None:
+                component = _components[name] = factory()
+    return component
+
+
+def get_feature_store():
+    """Shared team-form feature store, or None when form features are off"""
+    if not Config.FORM_FEATURES:
+        return None
+
+    def build():
+        from backend.data_processing.feature_store import TeamFormFeatureStore
+        feature_store = TeamFormFeatureStore(Config.FEATURE_STORE_PATH)
+        feature_store.load()
+        return feature_store
+
+    return _get('feature_store', build)
+
+
+def get_prediction_engine():
+    """Shared prediction engine"""
+    def build():
+        from backend.ml_models.prediction_engine import PredictionEngine
+        return PredictionEngine(Config.PREDICTION_MODEL, get_feature_store(), Config.MODEL_PATH)
+
+    return _get('prediction_engine', build)
+
+
+def get_online_learner():
+    """Shared online learner bound to the prediction engine"""
+    def build():
+        from backend.ml_models.online_learner import OnlineLearner
+        return OnlineLearner(get_prediction_engine(), Config.ONLINE_BATCH_SIZE,
+                             Config.ONLINE_MAX_BATCHES_PER_UPDATE, Config.ONLINE_PENDING_PATH)
+
+    return _get('online_learner', build)
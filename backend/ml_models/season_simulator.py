@@ -0,0 +1,156 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+
+class SeasonSimulator:
+    """Monte Carlo simulation of the rest of a league season
+
+    Match outcomes are drawn for a whole chunk of seasons at once as NumPy
+    arrays; each chunk has its own RNG stream spawned from one seed, so the
+    result is the same whether chunks run serially or in a process pool.
+    """
+
+    def __init__(self, prediction_engine=None, n_simulations=100000, chunk_size=10000,
+                 workers=1, seed=42, top_places=4, relegation_places=3):
+        self.engine = prediction_engine
+        self.n_simulations = n_simulations
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.seed = seed
+        self.top_places = top_places
+        self.relegation_places = relegation_places
+
+    def simulate(self, standings, fixtures, probabilities=None):
+        """Simulate remaining fixtures on top of current standings
+
+        standings: {team: {'points': int, 'goal_difference': int}}
+        fixtures: dicts with home_team, away_team and odds for the engine
+        probabilities: optional (n_fixtures, 3) home/draw/away matrix
+        """
+        teams = sorted(set(standings) | {f['home_team'] for f in fixtures} | {f['away_team'] for f in fixtures})
+        team_index = {team: i for i, team in enumerate(teams)}
+
+        if probabilities is None:
+            probabilities = self.engine.predict_probabilities(fixtures) if fixtures else np.empty((0, 3))
+        probabilities = np.asarray(probabilities, dtype=float)
+        probabilities = probabilities / probabilities.sum(axis=1, keepdims=True)
+
+        home_idx = np.array([team_index[f['home_team']] for f in fixtures], dtype=np.intp)
+        away_idx = np.array([team_index[f['away_team']] for f in fixtures], dtype=np.intp)
+        base_points = np.array([standings.get(team, {}).get('points', 0) for team in teams], dtype=np.int32)
+        goal_difference = np.array([standings.get(team, {}).get('goal_difference', 0) for team in teams],
+                                   dtype=float)
+
+        chunk_sizes = [min(self.chunk_size, self.n_simulations - start)
+                       for start in range(0, self.n_simulations, self.chunk_size)]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(chunk_sizes))
+        jobs = [(probabilities, home_idx, away_idx, base_points, goal_difference, size, seed)
+                for size, seed in zip(chunk_sizes, seeds)]
+
+        if self.workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                chunks = list(pool.map(_simulate_chunk, *zip(*jobs)))
+        else:
+            chunks = [_simulate_chunk(*job) for job in jobs]
+
+        position_counts = sum(chunk[0] for chunk in chunks)
+        points_counts = sum(chunk[1] for chunk in chunks)
+
+        return self._summarize(teams, position_counts, points_counts)
+
+    def _summarize(self, teams, position_counts, points_counts):
+        n_teams = len(teams)
+        position_probabilities = position_counts / self.n_simulations
+        points_values = np.arange(points_counts.shape[1])
+        relegation_start = max(n_teams - self.relegation_places, 0)
+
+        table = []
+        for i, team in enumerate(teams):
+            distribution = points_counts[i] / self.n_simulations
+            cumulative = np.cumsum(distribution)
+            table.append({
+                'team': team,
+                'title_probability': float(position_probabilities[i, 0]),
+                'top_probability': float(position_probabilities[i, :self.top_places].sum()),
+                'relegation_probability': float(position_probabilities[i, relegation_start:].sum()),
+                'expected_points': float((distribution * points_values).sum()),
+                'points_percentiles': {
+                    str(pct): int(np.searchsorted(cumulative, pct / 100))
+                    for pct in (5, 50, 95)
+                },
+                'position_probabilities': position_probabilities[i].tolist()
+            })
+
+        table.sort(key=lambda row: -row['expected_points'])
+        return {
+            'simulations': self.n_simulations,
+            'top_places': self.top_places,
+            'relegation_places': self.relegation_places,
+            'table': table
+        }
+
+
+def _simulate_chunk(probabilities, home_idx, away_idx, base_points, goal_difference, n_simulations, seed):
+    """Simulate n_simulations seasons; return position and final-points counts"""
+    rng = np.random.default_rng(seed)
+    n_teams = len(base_points)
+    n_fixtures = len(home_idx)
+
+    # Outcome per (season, fixture): home win if u < p_home, draw if below p_home + p_draw
+    draws = rng.random((n_simulations, n_fixtures), dtype=np.float32)
+    home_cut = probabilities[:, 0].astype(np.float32)
+    draw_cut = (probabilities[:, 0] + probabilities[:, 1]).astype(np.float32)
+    home_win = draws < home_cut
+    draw = ~home_win & (draws < draw_cut)
+    away_win = ~home_win & ~draw
+
+    home_points = (3 * home_win + draw).astype(np.float32)
+    away_points = (3 * away_win + draw).astype(np.float32)
+
+    # Team incidence matrices turn per-fixture points into per-team totals with one matmul
+    home_incidence = np.zeros((n_fixtures, n_teams), dtype=np.float32)
+    away_incidence = np.zeros((n_fixtures, n_teams), dtype=np.float32)
+    home_incidence[np.arange(n_fixtures), home_idx] = 1
+    away_incidence[np.arange(n_fixtures), away_idx] = 1
+
+    points = base_points + home_points @ home_incidence + away_points @ away_incidence
+    points = np.rint(points).astype(np.int32)
+
+    # Ties broken by current goal difference, then at random
+    tiebreak = goal_difference * 1e-3 + rng.random((n_simulations, n_teams)) * 1e-6
+    order = np.argsort(-(points + tiebreak), axis=1)
+    positions = np.empty_like(order)
+    np.put_along_axis(positions, order, np.arange(n_teams), axis=1)
+
+    team_rows = np.arange(n_teams)
+    position_counts = np.bincount(
+        (team_rows * n_teams + positions).ravel(), minlength=n_teams * n_teams
+    ).reshape(n_teams, n_teams)
+
+    max_points = int(base_points.max()) + 3 * n_fixtures + 1 if n_teams else 1
+    points_counts = np.bincount(
+        (team_rows * max_points + points).ravel(), minlength=n_teams * max_points
+    ).reshape(n_teams, max_points)
+
+    return position_counts, points_counts
+
+
+def standings_from_results(results):
+    """Points and goal difference from settled results (home/away teams and scores)"""
+    standings = {}
+    for result in results:
+        home = standings.setdefault(result['home_team'], {'points': 0, 'goal_difference': 0})
+        away = standings.setdefault(result['away_team'], {'points': 0, 'goal_difference': 0})
+        margin = (result['home_score'] or 0) - (result['away_score'] or 0)
+
+        home['goal_difference'] += margin
+        away['goal_difference'] -= margin
+        if margin > 0:
+            home['points'] += 3
+        elif margin < 0:
+            away['points'] += 3
+        else:
+            home['points'] += 1
+            away['points'] += 1
+
+    return standings
@@ -0,0 +1,114 @@
+"""Import-time benchmark for each entry point, using `python -X importtime`.
+
+Each target is imported in a fresh interpreter. The report gives the total
+self+cumulative import time, the heaviest top-level packages, and whether
+any module that target must not load (pandas, sklearn, ...) was imported.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --write-baseline benchmarks/import_time_baseline.json
+    python -m benchmarks.import_time --baseline benchmarks/import_time_baseline.json --tolerance 0.25
+
+Exits non-zero if a forbidden module is imported or, with --baseline, if a
+target got slower than baseline * (1 + tolerance).
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ['pandas', 'sklearn', 'joblib', 'scipy', 'selenium', 'bs4', 'webdriver_manager']
+
+# module to import -> top-level packages it must not pull in
+TARGETS = {
+    'entrypoints.api': HEAVY_MODULES,
+    'backend.ingestion.worker': HEAVY_MODULES + ['flask', 'numpy'],
+    'entrypoints.train': ['flask', 'selenium', 'bs4', 'webdriver_manager'],
+}
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure(module, runs=3):
+    """Best-of-N cumulative import time (us) and per-package breakdown"""
+    best = None
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+        packages = {}
+        total = 0
+        for line in result.stderr.splitlines():
+            match = IMPORTTIME_LINE.match(line)
+            if not match:
+                continue
+            self_us, cumulative_us, indent, name = match.groups()
+            # Top-level entries (least indented) sum to the whole import
+            if len(indent) == 1:
+                total += int(cumulative_us)
+            package = name.split('.')[0]
+            packages[package] = packages.get(package, 0) + int(self_us)
+
+        if best is None or total < best[0]:
+            best = (total, packages)
+
+    return best
+
+
+def run(targets, runs, top):
+    report = {}
+    for module, forbidden in targets.items():
+        total_us, packages = measure(module, runs)
+        heaviest = sorted(packages.items(), key=lambda item: -item[1])[:top]
+        report[module] = {
+            'total_ms': round(total_us / 1000, 1),
+            'heaviest_packages_ms': {name: round(us / 1000, 1) for name, us in heaviest},
+            'forbidden_imported': sorted(name for name in forbidden if name in packages),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import-time benchmark for entry points')
+    parser.add_argument('--runs', type=int, default=3, help='take the best of N fresh interpreters')
+    parser.add_argument('--top', type=int, default=8, help='heaviest packages to list')
+    parser.add_argument('--baseline', help='fail if a target is slower than this JSON report')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown vs baseline')
+    parser.add_argument('--write-baseline', help='write this run as the new baseline')
+    args = parser.parse_args()
+
+    report = run(TARGETS, args.runs, args.top)
+    failures = []
+
+    for module, stats in report.items():
+        print(f"{module:<28}{stats['total_ms']:>9.1f} ms   "
+              + ', '.join(f"{name} {ms}" for name, ms in stats['heaviest_packages_ms'].items()))
+        if stats['forbidden_imported']:
+            failures.append(f"{module} imports {', '.join(stats['forbidden_imported'])}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for module, stats in report.items():
+            previous = baseline.get(module, {}).get('total_ms')
+            if previous and stats['total_ms'] > previous * (1 + args.tolerance):
+                failures.append(f"{module}: {stats['total_ms']} ms vs baseline {previous} ms")
+
+    if args.write_baseline:
+        with open(args.write_baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,341 @@
+"""End-to-end load test against a local Odds API stub.
+
+Starts the stub in-process, launches entrypoints/api.py in a subprocess
+pointed at the stub and a throwaway SQLite database, then drives
+/api/matches, /api/predict/custom and the ingestion job concurrently.
+With --ingestion-mode workers, ingestion runs in entrypoints/worker.py
+processes and /api/matches/update only queues a job for them.
+
+    python -m benchmarks.load_test --duration 30 --concurrency 8 --fixtures 200
+    python -m benchmarks.load_test --ingestion-mode workers --worker-processes 2
+"""
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+from benchmarks.odds_api_stub import add_stub_arguments, make_server, stub_config_from_args, TEAMS
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class LatencyRecorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+        self.not_modified = {}
+
+    def record(self, name, seconds, status):
+        with self.lock:
+            self.samples.setdefault(name, []).append(seconds)
+            if status >= 400:
+                self.errors[name] = self.errors.get(name, 0) + 1
+            elif status == 304:
+                self.not_modified[name] = self.not_modified.get(name, 0) + 1
+
+    def summary(self, elapsed):
+        report = {}
+        with self.lock:
+            for name, samples in sorted(self.samples.items()):
+                ordered = sorted(samples)
+                report[name] = {
+                    'requests': len(ordered),
+                    'errors': self.errors.get(name, 0),
+                    'not_modified': self.not_modified.get(name, 0),
+                    'throughput_rps': round(len(ordered) / elapsed, 2),
+                    'p50_ms': round(percentile(ordered, 50) * 1000, 2),
+                    'p99_ms': round(percentile(ordered, 99) * 1000, 2),
+                    'max_ms': round(ordered[-1] * 1000, 2),
+                }
+        return report
+
+
+class MemorySampler(threading.Thread):
+    """Poll the server's resident set size from /proc (Linux only)"""
+
+    def __init__(self, pid, interval=0.5):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.is_set():
+            rss = read_rss_mb(self.pid)
+            if rss is not None:
+                self.samples.append(rss)
+            self.stopped.wait(self.interval)
+
+    def summary(self):
+        if not self.samples:
+            return None
+        return {
+            'start_mb': self.samples[0],
+            'peak_mb': max(self.samples),
+            'end_mb': self.samples[-1],
+        }
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+def read_rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def server_env(stub_url, workdir, ingestion_mode):
+    """Environment shared by the app server and ingestion workers
+
+    Every file the app writes goes in workdir, so a run never reads or
+    replaces the checkout's model, team form or polling state.
+    """
+    env = dict(os.environ)
+    env.update({
+        'ODDS_API_BASE_URL': stub_url,
+        'ODDS_API_KEY': 'load-test',
+        'DATABASE_URL': f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        'INGESTION_MODE': ingestion_mode,
+        'INGESTION_QUEUE_URL': f"sqlite:///{os.path.join(workdir, 'ingestion_queue.db')}",
+        'POLLING_STATE_FILE': os.path.join(workdir, 'polling_state.json'),
+        'DATA_VERSION_FILE': os.path.join(workdir, 'data_version.stamp'),
+        'MODEL_PATH': os.path.join(workdir, 'prediction_model.joblib'),
+        'FEATURE_STORE_PATH': os.path.join(workdir, 'feature_store.joblib'),
+        'ONLINE_PENDING_PATH': os.path.join(workdir, 'online_pending.joblib'),
+        'PYTHONUNBUFFERED': '1',
+    })
+    return env
+
+
+def start_app_server(env, port):
+    return subprocess.Popen(
+        [sys.executable, '-m', 'entrypoints.api', '--port', str(port)],
+        cwd=PROJECT_ROOT, env=env
+    )
+
+
+def start_ingestion_workers(env, processes):
+    return subprocess.Popen(
+        [sys.executable, '-m', 'entrypoints.worker', '--processes', str(processes)],
+        cwd=PROJECT_ROOT, env=env
+    )
+
+
+def wait_until_ready(base_url, process, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"App server exited with code {process.returncode}")
+        try:
+            requests.get(f"{base_url}/api/matches", params={'sport': 'all'}, timeout=2)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError('App server did not become ready')
+
+
+def wait_for_matches(base_url, process, timeout=300):
+    """Block until the ingestion workers have stored the first fixtures"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Ingestion workers exited with code {process.returncode}")
+        try:
+            response = requests.get(f"{base_url}/api/matches", params={'sport': 'all'}, timeout=5)
+            if response.json().get('count'):
+                return
+        except (requests.RequestException, ValueError):
+            pass
+        time.sleep(0.5)
+    raise RuntimeError('Ingestion workers stored no matches')
+
+
+def timed_request(session, recorder, name, method, url, **kwargs):
+    started = time.perf_counter()
+    try:
+        response = session.request(method, url, timeout=60, **kwargs)
+        status = response.status_code
+    except requests.RequestException:
+        response, status = None, 599
+    recorder.record(name, time.perf_counter() - started, status)
+    return response
+
+
+def api_worker(base_url, recorder, stop, seed, predict_share):
+    """Mix of frontend polls (with ETags) and custom predictions"""
+    rng = random.Random(seed)
+    session = requests.Session()
+    etags = {}
+
+    while not stop.is_set():
+        if rng.random() < predict_share:
+            home_team, away_team = rng.sample(TEAMS, 2)
+            timed_request(session, recorder, 'predict_custom', 'POST', f"{base_url}/api/predict/custom", json={
+                'home_team': home_team,
+                'away_team': away_team,
+                'league': 'EPL',
+                'home_odds': round(rng.uniform(1.3, 6.0), 2),
+                'away_odds': round(rng.uniform(1.3, 6.0), 2),
+                'draw_odds': round(rng.uniform(2.8, 4.5), 2),
+            })
+            continue
+
+        params = {'sport': rng.choice(['soccer_epl', 'all']), 'live': rng.choice(['false', 'true'])}
+        key = (params['sport'], params['live'])
+        headers = {'If-None-Match': etags[key]} if key in etags else {}
+        response = timed_request(session, recorder, 'matches', 'GET', f"{base_url}/api/matches",
+                                 params=params, headers=headers)
+        if response is not None and response.headers.get('ETag'):
+            etags[key] = response.headers['ETag']
+
+
+def ingestion_worker(base_url, recorder, stop, interval):
+    session = requests.Session()
+    while not stop.is_set():
+        timed_request(session, recorder, 'ingestion', 'GET', f"{base_url}/api/matches/update")
+        stop.wait(interval)
+
+
+def run_load_test(args):
+    stub_server = make_server(stub_config_from_args(args))
+    threading.Thread(target=stub_server.serve_forever, daemon=True).start()
+    stub_url = f"http://127.0.0.1:{stub_server.server_port}/v4"
+
+    workdir = tempfile.mkdtemp(prefix='soccer2-bench-')
+    port = args.app_port or free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = server_env(stub_url, workdir, args.ingestion_mode)
+    workers = None
+    if args.ingestion_mode == 'workers':
+        # Started first: their setup step creates the schema and trains the model
+        workers = start_ingestion_workers(env, args.worker_processes)
+    process = start_app_server(env, port)
+
+    try:
+        wait_until_ready(base_url, process)
+        sampler = MemorySampler(process.pid)
+        sampler.start()
+
+        # Warm up: first ingestion loads or trains the model and fills the table
+        warmup_started = time.perf_counter()
+        timed_request(requests.Session(), LatencyRecorder(), 'ingestion', 'GET',
+                      f"{base_url}/api/matches/update")
+        if workers:
+            wait_for_matches(base_url, workers)
+        warmup_ms = round((time.perf_counter() - warmup_started) * 1000, 2)
+
+        recorder = LatencyRecorder()
+        stop = threading.Event()
+        threads = [threading.Thread(target=ingestion_worker,
+                                    args=(base_url, recorder, stop, args.ingest_interval))]
+        threads += [threading.Thread(target=api_worker,
+                                     args=(base_url, recorder, stop, args.seed + i, args.predict_share))
+                    for i in range(args.concurrency)]
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(args.duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        sampler.stopped.set()
+
+        return {
+            'config': {
+                'duration_s': args.duration,
+                'concurrency': args.concurrency,
+                'fixtures': args.fixtures,
+                'bookmakers': args.bookmakers,
+                'stub_latency_ms': args.latency_ms,
+                'stub_error_rate': args.error_rate,
+                'ingest_interval_s': args.ingest_interval,
+                'ingestion_mode': args.ingestion_mode,
+                'worker_processes': args.worker_processes if workers else 0,
+            },
+            'elapsed_s': round(elapsed, 2),
+            'warmup_ingestion_ms': warmup_ms,
+            'endpoints': recorder.summary(elapsed),
+            'server_memory': sampler.summary(),
+            'stub_requests': stub_server.stub.requests_used,
+        }
+    finally:
+        for child in (process, workers):
+            if child:
+                child.terminate()
+                child.wait(timeout=10)
+        stub_server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def print_report(report):
+    print(f"\nLoad test: {report['elapsed_s']}s, {report['config']['concurrency']} workers, "
+          f"{report['config']['fixtures']} fixtures x {report['config']['bookmakers']} bookmakers")
+    print(f"Warm-up ingestion ({report['config']['ingestion_mode']}): {report['warmup_ingestion_ms']} ms")
+    print(f"{'endpoint':<16}{'requests':>10}{'errors':>8}{'304':>8}{'req/s':>10}"
+          f"{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, stats in report['endpoints'].items():
+        print(f"{name:<16}{stats['requests']:>10}{stats['errors']:>8}{stats['not_modified']:>8}"
+              f"{stats['throughput_rps']:>10}{stats['p50_ms']:>10}{stats['p99_ms']:>10}{stats['max_ms']:>10}")
+    memory = report['server_memory']
+    if memory:
+        print(f"Server RSS: start {memory['start_mb']} MB, peak {memory['peak_mb']} MB, "
+              f"end {memory['end_mb']} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end API load test')
+    parser.add_argument('--duration', type=float, default=30, help='seconds of load')
+    parser.add_argument('--concurrency', type=int, default=8, help='API worker threads')
+    parser.add_argument('--predict-share', type=float, default=0.2,
+                        help='fraction of worker requests that are custom predictions')
+    parser.add_argument('--ingest-interval', type=float, default=5, help='seconds between ingestions')
+    parser.add_argument('--app-port', type=int, default=0, help='port for the app server (default: free)')
+    parser.add_argument('--ingestion-mode', choices=['inline', 'workers'], default='inline',
+                        help="'workers' runs ingestion in worker processes fed through the job queue")
+    parser.add_argument('--worker-processes', type=int, default=2,
+                        help='ingestion worker processes in workers mode')
+    parser.add_argument('--output', help='write the JSON report here')
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    report = run_load_test(args)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+"""Local stand-in for the Odds API v4, for load tests that must not spend quota.
+
+    python -m benchmarks.odds_api_stub --port 8765 --fixtures 200 --bookmakers 10
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+SPORTS = [
+    ('soccer_epl', 'Soccer', 'EPL', 'English Premier League'),
+    ('soccer_spain_la_liga', 'Soccer', 'La Liga - Spain', 'Spanish Soccer'),
+    ('soccer_germany_bundesliga', 'Soccer', 'Bundesliga - Germany', 'German Soccer'),
+    ('soccer_italy_serie_a', 'Soccer', 'Serie A - Italy', 'Italian Soccer'),
+    ('basketball_nba', 'Basketball', 'NBA', 'US Basketball'),
+]
+
+TEAMS = [
+    'Arsenal', 'Aston Villa', 'Brentford', 'Brighton and Hove Albion', 'Burnley',
+    'Chelsea', 'Crystal Palace', 'Everton', 'Fulham', 'Liverpool', 'Luton Town',
+    'Manchester City', 'Manchester United', 'Newcastle United', 'Nottingham Forest',
+    'Sheffield United', 'Tottenham Hotspur', 'West Ham United', 'Wolverhampton Wanderers',
+    'AFC Bournemouth',
+]
+
+ODDS_PATH = re.compile(r'^/v4/sports/([^/]+)/odds/?$')
+
+
+class StubConfig:
+    def __init__(self, fixtures=100, bookmakers=8, latency_ms=0, jitter_ms=0,
+                 error_rate=0.0, quota=500, seed=42):
+        self.fixtures = fixtures
+        self.bookmakers = bookmakers
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.quota = quota
+        self.seed = seed
+
+
+def generate_fixtures(sport_key, sport_title, count, bookmakers, seed):
+    """Deterministic fixtures spread from two hours ago to a week ahead"""
+    rng = random.Random(f"{seed}:{sport_key}")
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    fixtures = []
+
+    for i in range(count):
+        home_team, away_team = rng.sample(TEAMS, 2)
+        commence_time = now + timedelta(minutes=rng.randint(-120, 7 * 24 * 60))
+
+        home_prob = rng.uniform(0.2, 0.6)
+        draw_prob = rng.uniform(0.2, 0.3)
+        away_prob = max(0.05, 1 - home_prob - draw_prob)
+
+        books = []
+        for b in range(bookmakers):
+            margin = rng.uniform(1.02, 1.08)
+            books.append({
+                'key': f"book{b}",
+                'title': f"Bookmaker {b}",
+                'last_update': now.isoformat().replace('+00:00', 'Z'),
+                'markets': [{
+                    'key': 'h2h',
+                    'outcomes': [
+                        {'name': home_team, 'price': round(1 / (home_prob * margin), 2)},
+                        {'name': away_team, 'price': round(1 / (away_prob * margin), 2)},
+                        {'name': 'Draw', 'price': round(1 / (draw_prob * margin), 2)},
+                    ]
+                }]
+            })
+
+        fixtures.append({
+            'id': f"{sport_key}-{i:05d}",
+            'sport_key': sport_key,
+            'sport_title': sport_title,
+            'commence_time': commence_time.isoformat().replace('+00:00', 'Z'),
+            'home_team': home_team,
+            'away_team': away_team,
+            'bookmakers': books,
+        })
+
+    return fixtures
+
+
+class OddsAPIStub:
+    def __init__(self, config):
+        self.config = config
+        self.requests_used = 0
+        self.lock = threading.Lock()
+        self.rng = random.Random(config.seed)
+        self.sports_body = json.dumps([
+            {'key': key, 'group': group, 'title': title, 'description': description,
+             'active': True, 'has_outrights': False}
+            for key, group, title, description in SPORTS
+        ]).encode('utf-8')
+        # Rendered once, so the stub itself is never the bottleneck
+        self.odds_bodies = {
+            key: json.dumps(generate_fixtures(
+                key, title, config.fixtures, config.bookmakers, config.seed
+            )).encode('utf-8')
+            for key, _, title, _ in SPORTS
+        }
+
+    def handle(self, path):
+        """Return (status, body, headers) for a GET path"""
+        with self.lock:
+            self.requests_used += 1
+            used = self.requests_used
+            fail = self.rng.random() < self.config.error_rate
+            delay = self.config.latency_ms + self.rng.uniform(0, self.config.jitter_ms)
+
+        if delay:
+            time.sleep(delay / 1000)
+
+        headers = {
+            'x-requests-used': str(used),
+            'x-requests-remaining': str(max(0, self.config.quota - used)),
+        }
+        if fail:
+            return 500, b'{"message": "Stub injected error"}', headers
+
+        path = urlparse(path).path
+        if path.rstrip('/') == '/v4/sports':
+            return 200, self.sports_body, headers
+
+        match = ODDS_PATH.match(path)
+        if match:
+            body = self.odds_bodies.get(match.group(1))
+            if body is not None:
+                return 200, body, headers
+            return 404, b'{"message": "Unknown sport"}', headers
+
+        return 404, b'{"message": "Not found"}', headers
+
+
+def make_server(config, host='127.0.0.1', port=0):
+    """Build a threaded stub server; port 0 picks a free port"""
+    stub = OddsAPIStub(config)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            status, body, headers = stub.handle(self.path)
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.stub = stub
+    return server
+
+
+def add_stub_arguments(parser):
+    parser.add_argument('--fixtures', type=int, default=100, help='fixtures per sport')
+    parser.add_argument('--bookmakers', type=int, default=8, help='bookmakers per fixture')
+    parser.add_argument('--latency-ms', type=float, default=0, help='added latency per request')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='uniform extra latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of 500 responses')
+    parser.add_argument('--quota', type=int, default=500, help='x-requests-remaining start value')
+    parser.add_argument('--seed', type=int, default=42)
+
+
+def stub_config_from_args(args):
+    return StubConfig(args.fixtures, args.bookmakers, args.latency_ms, args.jitter_ms,
+                      args.error_rate, args.quota, args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local Odds API v4 stub')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    server = make_server(stub_config_from_args(args), args.host, args.port)
+    print(f"Odds API stub listening on http://{args.host}:{server.server_port}/v4")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
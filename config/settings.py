@@ -0,0 +1,57 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+class Config:
+    # Database
+    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///sports_analytics.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    
+    # API Keys (Add your actual keys in .env file)
+    ODDS_API_KEY = os.getenv('ODDS_API_KEY', 'your_odds_api_key_here')
+    SPORTSDATA_API_KEY = os.getenv('SPORTSDATA_API_KEY', 'your_sportsdata_key_here')
+    THE_SPORTS_API_KEY = os.getenv('THE_SPORTS_API_KEY', 'your_sports_api_key_here')
+    
+    # API Endpoints
+    ODDS_API_BASE_URL = os.getenv('ODDS_API_BASE_URL', "https://api.the-odds-api.com/v4")
+    SPORTSDATA_BASE_URL = os.getenv('SPORTSDATA_BASE_URL', "https://api.sportsdata.io/v3")
+    
+    # Update intervals (seconds)
+    UPDATE_INTERVAL = 300  # 5 minutes
+    
+    # Ingestion: 'inline' runs the scheduler in the web process, 'workers'
+    # leaves it to `python -m backend.ingestion.worker`
+    INGESTION_MODE = os.getenv('INGESTION_MODE', 'inline')
+    INGESTION_SPORTS = [s for s in os.getenv('INGESTION_SPORTS', 'soccer_epl').split(',') if s]
+    INGESTION_BATCH_SIZE = 200
+    INGESTION_QUEUE_URL = os.getenv('INGESTION_QUEUE_URL', 'sqlite:///ingestion_queue.db')
+    # Adaptive polling within the Odds API monthly quota
+    ODDS_API_MONTHLY_QUOTA = int(os.getenv('ODDS_API_MONTHLY_QUOTA', 500))
+    POLLING_STATE_FILE = os.getenv('POLLING_STATE_FILE', 'polling_state.json')
+    POLLING_CHECK_INTERVAL = 30  # seconds between planner checks
+    # Touched by every writer so each process's response cache sees new data
+    DATA_VERSION_FILE = os.getenv('DATA_VERSION_FILE', 'data_version.stamp')
+    
+    # Retention: finished matches move to the archive table after this long
+    ARCHIVE_AFTER_HOURS = int(os.getenv('ARCHIVE_AFTER_HOURS', 24))
+    ARCHIVE_BATCH_SIZE = 500
+    ARCHIVE_INTERVAL = 3600  # 1 hour
+    
+    # API responses
+    MATCHES_PAGE_SIZE = 50
+    SPORTS_CACHE_TTL = 3600  # 1 hour
+    
+    # Prediction model: 'random_forest' (batch only) or 'sgd' (supports online updates)
+    PREDICTION_MODEL = os.getenv('PREDICTION_MODEL', 'random_forest')
+    FORM_FEATURES = os.getenv('FORM_FEATURES', 'true').lower() == 'true'
+    MODEL_PATH = os.getenv('MODEL_PATH', 'backend/ml_models/saved_models/prediction_model.joblib')
+    FEATURE_STORE_PATH = os.getenv('FEATURE_STORE_PATH', 'backend/ml_models/saved_models/feature_store.joblib')
+    ONLINE_BATCH_SIZE = 64
+    ONLINE_MAX_BATCHES_PER_UPDATE = 8
+    # Settled results waiting for an online update, kept across restarts
+    ONLINE_PENDING_PATH = os.getenv('ONLINE_PENDING_PATH', 'backend/ml_models/saved_models/online_pending.joblib')
+    
+    # Season simulation
+    SIMULATION_RUNS = 100000
+    SIMULATION_WORKERS = int(os.getenv('SIMULATION_WORKERS', 1))
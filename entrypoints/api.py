@@ -0,0 +1,25 @@
+"""API server only: serves reads, runs no scheduler and loads no ML code until a
+prediction route needs it. Pair with `python -m entrypoints.worker` for ingestion.
+
+    python -m entrypoints.api --port 5000
+"""
+import argparse
+from werkzeug.serving import make_server
+
+from app import app, init_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the Sports Analytics API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    args = parser.parse_args()
+
+    init_database()
+    server = make_server(args.host, args.port, app, threaded=True)
+    print(f"Serving on http://{args.host}:{args.port}", flush=True)
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
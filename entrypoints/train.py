@@ -0,0 +1,31 @@
+"""Train and save the prediction model without starting Flask or the scheduler.
+
+    python -m entrypoints.train
+"""
+import argparse
+import time
+
+from backend.ml_models.registry import get_prediction_engine
+from config.settings import Config
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train the prediction model')
+    parser.parse_args()
+
+    started = time.perf_counter()
+    engine = get_prediction_engine()
+    engine.train_model()
+    print(f"Saved {engine.model_path} in {time.perf_counter() - started:.1f}s")
+
+    if engine.feature_store:
+        # Serving form comes from settled results in the database
+        from backend.database.results import load_settled_results
+        results = load_settled_results(Config.SQLALCHEMY_DATABASE_URI)
+        teams = engine.feature_store.build_from_results(results)
+        engine.feature_store.save()
+        print(f"Team form rebuilt for {teams} teams from {len(results)} results")
+
+
+if __name__ == '__main__':
+    main()
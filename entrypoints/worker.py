@@ -0,0 +1,8 @@
+"""Ingestion coordinator and workers (see backend.ingestion.worker).
+
+    python -m entrypoints.worker --processes 4
+"""
+from backend.ingestion.worker import main
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+APP_DEPENDENCIES = ('flask', 'flask_cors', 'flask_sqlalchemy', 'dotenv', 'requests', 'schedule')
+
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    """The app module, configured (before its first import) to keep every file in a temp dir"""
+    for name in APP_DEPENDENCIES:
+        pytest.importorskip(name)
+
+    workdir = tmp_path_factory.mktemp('app')
+    os.environ.update({
+        'DATABASE_URL': f"sqlite:///{workdir / 'test.db'}",
+        'DATA_VERSION_FILE': str(workdir / 'data_version.stamp'),
+        'POLLING_STATE_FILE': str(workdir / 'polling_state.json'),
+        'FEATURE_STORE_PATH': str(workdir / 'feature_store.joblib'),
+        'MODEL_PATH': str(workdir / 'prediction_model.joblib'),
+        'ONLINE_PENDING_PATH': str(workdir / 'online_pending.joblib'),
+        'FORM_FEATURES': 'false',
+        'PREDICTION_MODEL': 'random_forest',
+    })
+
+    import app
+    app.init_database()
+    return app
+
+
+@pytest.fixture
+def app_db(app_module):
+    """App context with empty tables for each test"""
+    from backend.database.models import db
+    with app_module.app.app_context():
+        yield db
+        db.session.remove()
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+flask = pytest.importorskip('flask')
+pytest.importorskip('flask_sqlalchemy')
+
+from backend.database.models import db, Match, ArchivedMatch
+from backend.database.archiver import MatchArchiver
+
+NOW = datetime(2024, 10, 20, 12, 0)
+
+
+@pytest.fixture
+def app():
+    app = flask.Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+def add_match(match_id, hours_ago, is_live=False, status=None, settled=False):
+    db.session.add(Match(
+        match_id=match_id, sport_key='soccer_epl', sport_title='EPL',
+        home_team='Arsenal', away_team='Chelsea',
+        commence_time=NOW - timedelta(hours=hours_ago),
+        is_live=is_live, match_status=status,
+        settled_at=NOW if settled else None
+    ))
+    db.session.commit()
+
+
+def test_archives_matches_older_than_retention(app):
+    add_match('old', 30, status='Final', settled=True)
+    add_match('recent', 2, is_live=True)
+
+    assert MatchArchiver(archive_after_hours=24).archive_finished_matches(NOW) == 1
+    assert [m.match_id for m in Match.query] == ['recent']
+    assert [m.match_id for m in ArchivedMatch.query] == ['old']
+
+
+def test_archives_stale_live_flag_and_clears_it(app):
+    # Dropped out of the feed mid-game, so is_live was never recomputed
+    add_match('stale', 48, is_live=True, status='In Progress')
+
+    assert MatchArchiver(archive_after_hours=24).archive_finished_matches(NOW) == 1
+    archived = ArchivedMatch.query.one()
+    assert archived.match_id == 'stale'
+    assert archived.is_live is False
+
+
+def test_short_retention_only_archives_settled_matches(app):
+    add_match('live', 1, is_live=True, status='In Progress')
+    add_match('overdue', 5, is_live=True, status='In Progress')
+    add_match('unsettled', 4, status='Final')
+    add_match('settled', 3, status='Final', settled=True)
+
+    assert MatchArchiver(archive_after_hours=0).archive_finished_matches(NOW) == 1
+    assert [m.match_id for m in ArchivedMatch.query] == ['settled']
+    assert sorted(m.match_id for m in Match.query) == ['live', 'overdue', 'unsettled']
+
+
+def test_unsettled_final_stays_until_settled(app):
+    add_match('final', 48, status='Final')
+
+    assert MatchArchiver(archive_after_hours=24).archive_finished_matches(NOW) == 0
+    assert Match.query.count() == 1
+
+
+def test_archives_in_batches(app):
+    for i in range(5):
+        add_match(f"m{i}", 30 + i)
+
+    assert MatchArchiver(archive_after_hours=24, batch_size=2).archive_finished_matches(NOW) == 5
+    assert Match.query.count() == 0
+    assert ArchivedMatch.query.count() == 5
+
+
+def test_table_stats_compares_hot_and_history_queries(app):
+    add_match('old', 30)
+    add_match('recent', 2)
+    MatchArchiver(archive_after_hours=24).archive_finished_matches(NOW)
+
+    stats = MatchArchiver().table_stats(page_size=10, runs=1)
+    assert stats['hot_rows'] == 1
+    assert stats['archived_rows'] == 1
+    assert stats['hot_query_ms'] >= 0
+    assert stats['history_query_ms'] >= 0
+
+
+def test_settled_results_span_both_tables_oldest_first(app):
+    add_match('archived', 30, status='Final')
+    add_match('settled', 5, status='Final')
+    add_match('playing', 1, is_live=True, status='In Progress')
+    MatchArchiver(archive_after_hours=24).archive_finished_matches(NOW)
+
+    results = MatchArchiver().settled_results()
+    assert [r['played_at'] for r in results] == [NOW - timedelta(hours=30), NOW - timedelta(hours=5)]
+    assert set(results[0]) == {'home_team', 'away_team', 'home_goals', 'away_goals', 'played_at'}
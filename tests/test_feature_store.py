@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+np = pytest.importorskip('numpy')
+pytest.importorskip('joblib')
+
+from backend.data_processing.feature_store import FORM_FEATURES, TeamFormFeatureStore
+
+START = datetime(2024, 8, 1, 15, 0)
+TEAMS = ['Arsenal', 'Chelsea', 'Everton']
+
+
+def history():
+    """Every pairing home and away, four rounds: eight matches per team"""
+    rows = []
+    scores = [(2, 0), (1, 1), (0, 3), (4, 2), (1, 0), (0, 0)]
+    for i in range(12):
+        home, away = [(a, b) for a in TEAMS for b in TEAMS if a != b][i % 6]
+        home_goals, away_goals = scores[(i * 5) % len(scores)]
+        rows.append({'home_team': home, 'away_team': away, 'home_goals': home_goals,
+                     'away_goals': away_goals, 'played_at': START + timedelta(days=3 * i + i % 2)})
+    return pd.DataFrame(rows)
+
+
+def test_rolling_features_match_incremental_pre_match_state():
+    df = history()
+    rolling = TeamFormFeatureStore().rolling_features(df)
+
+    store = TeamFormFeatureStore()
+    for i, row in df.iterrows():
+        # What serving would have seen at kickoff, before the result is recorded
+        expected = store.get_fixture_features(row['home_team'], row['away_team'], row['played_at'])
+        np.testing.assert_allclose(rolling.loc[i, FORM_FEATURES].to_numpy(dtype=float), expected,
+                                   err_msg=f"row {i}")
+        store.record_result(row['home_team'], row['away_team'],
+                            row['home_goals'], row['away_goals'], row['played_at'])
+
+
+def test_rolling_features_ignore_each_matchs_own_result():
+    df = history()
+    changed = df.copy()
+    changed.loc[len(df) - 1, ['home_goals', 'away_goals']] = (9, 9)
+
+    store = TeamFormFeatureStore()
+    pd.testing.assert_frame_equal(store.rolling_features(df), store.rolling_features(changed))
+
+
+def test_home_away_split_carries_forward_across_other_venue():
+    df = pd.DataFrame([
+        {'home_team': 'Arsenal', 'away_team': 'Chelsea', 'home_goals': 1, 'away_goals': 0,
+         'played_at': START},
+        {'home_team': 'Everton', 'away_team': 'Arsenal', 'home_goals': 2, 'away_goals': 2,
+         'played_at': START + timedelta(days=7)},
+        {'home_team': 'Chelsea', 'away_team': 'Arsenal', 'home_goals': 1, 'away_goals': 0,
+         'played_at': START + timedelta(days=14)},
+    ])
+    rolling = TeamFormFeatureStore().rolling_features(df)
+
+    # Arsenal's home split is its one home win, carried through an away match
+    assert rolling.loc[2, 'away_home_points_5'] == 3.0
+    # Its away split is the earlier draw only; this match's defeat would make it 0.5
+    assert rolling.loc[2, 'away_away_points_5'] == 1.0
+
+
+def test_batch_features_stack_fixture_features():
+    store = TeamFormFeatureStore()
+    store.build_from_history(history())
+    fixtures = [('Arsenal', 'Chelsea', START + timedelta(days=60)), ('Everton', 'Newcomers', None)]
+
+    batch = store.get_batch_features(fixtures)
+
+    assert batch.shape == (2, len(FORM_FEATURES))
+    np.testing.assert_allclose(batch[0], store.get_fixture_features(*fixtures[0]))
+    assert store.get_batch_features([]).shape == (0, len(FORM_FEATURES))
+
+
+def test_build_from_history_matches_recording_results(tmp_path):
+    df = history()
+    recorded = TeamFormFeatureStore()
+    for _, row in df.iterrows():
+        recorded.record_result(row['home_team'], row['away_team'],
+                               row['home_goals'], row['away_goals'], row['played_at'])
+
+    saved = TeamFormFeatureStore(str(tmp_path / 'feature_store.joblib'))
+    saved.build_from_results(df.to_dict('records'))
+    saved.save()
+    loaded = TeamFormFeatureStore(saved.path)
+
+    assert loaded.load()
+    kickoff = START + timedelta(days=60)
+    for team in TEAMS:
+        np.testing.assert_allclose(loaded.get_fixture_features(team, 'Arsenal', kickoff),
+                                   recorded.get_fixture_features(team, 'Arsenal', kickoff))
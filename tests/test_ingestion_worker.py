@@ -0,0 +1,16 @@
+import pytest
+
+pytest.importorskip('schedule')
+
+from backend.ingestion.worker import assign_shards
+
+
+def test_assign_shards_balances_few_sports():
+    shards = assign_shards(['soccer_epl', 'soccer_spain_la_liga', 'basketball_nba', 'soccer_italy_serie_a'], 3)
+    assert sorted(len(sports) for sports in shards.values()) == [1, 1, 2]
+    assert len(shards) == 3
+
+
+def test_assign_shards_is_independent_of_input_order():
+    sports = ['b', 'a', 'd', 'c', 'a']
+    assert assign_shards(sports, 2) == assign_shards(sorted(sports), 2) == {0: ['a', 'c'], 1: ['b', 'd']}
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self.payload
+
+
+@pytest.fixture
+def sportsdata_feed(app_module, monkeypatch):
+    """Serve canned GamesByDate payloads and record the URLs requested"""
+    from backend.api_integration import sportsdata_client
+
+    feed = {'games': [], 'urls': []}
+
+    def fake_get(url, headers=None, **kwargs):
+        feed['urls'].append(url)
+        return FakeResponse(feed['games'])
+
+    monkeypatch.setattr(sportsdata_client.requests, 'get', fake_get)
+    return feed
+
+
+def add_match(app_db, match_id, home_team, away_team, commence_time, **columns):
+    from backend.database.models import Match
+    match = Match(match_id=match_id, sport_key='soccer_epl', sport_title='EPL',
+                  home_team=home_team, away_team=away_team, commence_time=commence_time, **columns)
+    app_db.session.add(match)
+    app_db.session.commit()
+    return match
+
+
+def game(home, away, kickoff, status, home_score, away_score):
+    return {'HomeTeamName': home, 'AwayTeamName': away, 'DateTime': kickoff.isoformat(),
+            'Status': status, 'HomeTeamScore': home_score, 'AwayTeamScore': away_score}
+
+
+def test_live_game_updates_score_through_resolver(app_module, app_db, sportsdata_feed):
+    from backend.database.models import Match
+
+    kickoff = datetime.utcnow().replace(microsecond=0) - timedelta(minutes=40)
+    add_match(app_db, 'epl-1', 'Manchester United', 'Tottenham Hotspur', kickoff, is_live=True)
+    sportsdata_feed['games'] = [game('Man Utd', 'Spurs', kickoff, 'InProgress', 1, 0)]
+
+    assert app_module.update_live_scores() == 1
+    assert '/soccer/scores/json/GamesByDate/' in sportsdata_feed['urls'][0]
+
+    match = Match.query.filter_by(match_id='epl-1').one()
+    assert (match.home_score, match.away_score, match.match_status) == (1, 0, 'In Progress')
+
+
+def test_unmatched_and_scheduled_games_are_ignored(app_module, app_db, sportsdata_feed):
+    kickoff = datetime.utcnow().replace(microsecond=0) - timedelta(minutes=40)
+    add_match(app_db, 'epl-1', 'Arsenal', 'Chelsea', kickoff, is_live=True)
+    sportsdata_feed['games'] = [
+        game('Everton', 'Fulham', kickoff, 'InProgress', 2, 2),
+        game('Arsenal FC', 'Chelsea FC', kickoff, 'Scheduled', 0, 0),
+    ]
+
+    assert app_module.update_live_scores() == 0
+
+
+def test_final_game_stores_final_score_and_settles_once(app_module, app_db, sportsdata_feed):
+    from backend.database.models import Match
+
+    kickoff = datetime.utcnow().replace(microsecond=0) - timedelta(hours=2)
+    add_match(app_db, 'epl-1', 'Arsenal', 'Chelsea', kickoff,
+              is_live=True, match_status='In Progress', home_score=1, away_score=1)
+    sportsdata_feed['games'] = [game('Arsenal', 'Chelsea', kickoff, 'Final', 2, 1)]
+
+    assert app_module.update_live_scores() == 1
+    match = Match.query.filter_by(match_id='epl-1').one()
+    assert (match.home_score, match.away_score, match.match_status, match.is_live) == (2, 1, 'Final', False)
+
+    assert app_module.settle_finished_matches() == 1
+    assert app_module.settle_finished_matches() == 0
+    assert Match.query.filter_by(match_id='epl-1').one().settled_at is not None
+
+
+def test_unfinished_match_is_not_settled_by_age(app_module, app_db, sportsdata_feed):
+    kickoff = datetime.utcnow().replace(microsecond=0) - timedelta(hours=6)
+    add_match(app_db, 'epl-1', 'Arsenal', 'Chelsea', kickoff, is_live=True, match_status='In Progress')
+
+    assert app_module.settle_finished_matches() == 0
@@ -0,0 +1,42 @@
+import pytest
+
+
+@pytest.fixture
+def client(app_module, app_db):
+    return app_module.app.test_client()
+
+
+@pytest.mark.parametrize('page', ['-1', '0', 'abc'])
+def test_invalid_page_is_rejected(client, page):
+    response = client.get(f"/api/matches?page={page}")
+
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+def test_first_page(client):
+    response = client.get('/api/matches?page=1')
+
+    assert response.status_code == 200
+    assert response.get_json()['count'] == 0
+
+
+@pytest.mark.parametrize('simulations', ['abc', '0', '-5'])
+def test_invalid_simulation_count_is_rejected(client, simulations):
+    response = client.get(f"/api/simulate/season?simulations={simulations}")
+
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+def test_updates_are_queued_for_workers(app_module, client, monkeypatch):
+    from backend.ingestion.work_queue import MemoryWorkQueue
+
+    queue = MemoryWorkQueue()
+    monkeypatch.setattr(app_module, 'ingestion_queue', queue)
+
+    assert client.get('/api/matches/update').status_code == 202
+    assert client.get('/api/live/update').status_code == 202
+    assert client.get('/api/live/update').get_json()['queued'] is False
+
+    assert [queue.lease(0).kind, queue.lease(0).kind, queue.lease(0)] == ['odds', 'live_scores', None]
@@ -0,0 +1,149 @@
+import json
+import multiprocessing
+import os
+from datetime import datetime, timezone
+
+from backend.api_integration.polling_planner import MAX_INTERVAL, REQUEST_TIMEOUT, PollingPlanner
+
+HOUR = 3600
+
+
+def ts(*args):
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+def iso(timestamp):
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+def observe(planner, sport, now, remaining, kickoffs=(), cost=1):
+    planner.observe_response(sport, {
+        'x-requests-remaining': str(remaining),
+        'x-requests-used': str(planner.monthly_quota - remaining),
+        'x-requests-last': str(cost),
+    }, [{'commence_time': iso(kickoff)} for kickoff in kickoffs], now=now)
+
+
+def test_unseen_sports_are_due():
+    assert PollingPlanner(500).due_sports(['soccer_epl', 'soccer_epl', 'basketball_nba']) == \
+        ['soccer_epl', 'basketball_nba']
+
+
+def test_ample_budget_keeps_tier_intervals():
+    now = ts(2024, 10, 20)
+    planner = PollingPlanner(20000)
+    observe(planner, 'live', now, remaining=16000, kickoffs=[now - HOUR])
+    observe(planner, 'distant', now, remaining=16000, kickoffs=[now + 10 * 24 * HOUR])
+
+    assert planner.plan(['live', 'distant'], now) == {'live': 120, 'distant': 12 * HOUR}
+
+
+def test_tight_budget_goes_to_the_most_urgent_sport():
+    now = ts(2024, 10, 10)
+    planner = PollingPlanner(500)
+    observe(planner, 'live', now, remaining=100, kickoffs=[now - HOUR])
+    observe(planner, 'distant', now, remaining=100, kickoffs=[now + 10 * 24 * HOUR])
+
+    intervals = planner.plan(['live', 'distant'], now)
+    assert intervals['distant'] == MAX_INTERVAL
+    assert intervals['live'] < intervals['distant']
+
+
+def test_spent_budget_still_probes_every_max_interval():
+    now = ts(2024, 10, 20)
+    planner = PollingPlanner(500)
+    observe(planner, 'soccer_epl', now, remaining=10, kickoffs=[now + HOUR])
+
+    assert planner.plan(['soccer_epl'], now) == {'soccer_epl': MAX_INTERVAL}
+    assert planner.due_sports(['soccer_epl'], now + HOUR) == []
+    assert planner.due_sports(['soccer_epl'], now + MAX_INTERVAL) == ['soccer_epl']
+
+
+def test_quota_spent_last_month_does_not_block_the_new_month():
+    observed = ts(2024, 10, 30, 12)
+    planner = PollingPlanner(500)
+    observe(planner, 'soccer_epl', observed, remaining=20, kickoffs=[ts(2024, 11, 5, 13)])
+
+    assert planner.due_sports(['soccer_epl'], observed + HOUR) == []
+
+    now = ts(2024, 11, 5, 12)
+    assert planner.remaining_credits(now) == 500
+    assert planner.plan(['soccer_epl'], now)['soccer_epl'] < MAX_INTERVAL
+    assert planner.due_sports(['soccer_epl'], now) == ['soccer_epl']
+
+
+def test_december_observation_expires_in_january():
+    planner = PollingPlanner(500)
+    observe(planner, 'soccer_epl', ts(2024, 12, 31, 23), remaining=0)
+
+    assert planner.remaining_credits(ts(2024, 12, 31, 23, 30)) == 0
+    assert planner.remaining_credits(ts(2025, 1, 1, 0, 30)) == 500
+
+
+def test_state_file_keeps_observation_time(tmp_path):
+    state_file = str(tmp_path / 'polling_state.json')
+    observed = ts(2024, 10, 30)
+    observe(PollingPlanner(500, state_file=state_file), 'soccer_epl', observed, remaining=20)
+
+    restarted = PollingPlanner(500, state_file=state_file)
+    assert restarted.due_sports(['soccer_epl'], observed + HOUR) == []
+    assert restarted.due_sports(['soccer_epl'], ts(2024, 11, 1, 1)) == ['soccer_epl']
+
+
+def test_requested_sport_is_not_due_until_polled():
+    now = ts(2024, 10, 20)
+    planner = PollingPlanner(500)
+    planner.mark_requested(['soccer_epl'], now)
+
+    assert planner.due_sports(['soccer_epl', 'basketball_nba'], now + 30) == ['basketball_nba']
+
+    # The worker's response clears it; the planned interval applies from there
+    observe(planner, 'soccer_epl', now + 60, remaining=400, kickoffs=[now + 30 * 60])
+    assert planner.due_sports(['soccer_epl'], now + 90) == []
+    assert planner.due_sports(['soccer_epl'], now + 60 + MAX_INTERVAL) == ['soccer_epl']
+
+
+def test_lost_request_is_retried_after_timeout():
+    now = ts(2024, 10, 20)
+    planner = PollingPlanner(500)
+    planner.mark_requested(['soccer_epl'], now)
+
+    assert planner.due_sports(['soccer_epl'], now + 60) == []
+    assert planner.due_sports(['soccer_epl'], now + REQUEST_TIMEOUT) == ['soccer_epl']
+
+
+def test_processes_writing_the_state_file_keep_each_others_sports(tmp_path):
+    state_file = str(tmp_path / 'polling_state.json')
+    now = ts(2024, 10, 20)
+    first = PollingPlanner(500, state_file=state_file)
+    second = PollingPlanner(500, state_file=state_file)
+    observe(first, 'tennis_atp', now, remaining=400)
+    second.due_sports(['tennis_atp'], now)
+
+    observe(first, 'soccer_epl', now, remaining=399)
+    # A write within the filesystem's mtime resolution looks unchanged to second
+    os.utime(state_file, ns=(second.state_mtime, second.state_mtime))
+    observe(second, 'basketball_nba', now + 1, remaining=398)
+
+    with open(state_file) as f:
+        assert sorted(json.load(f)['sports']) == ['basketball_nba', 'soccer_epl', 'tennis_atp']
+
+
+def _observe_many(state_file, sport, count):
+    planner = PollingPlanner(500, state_file=state_file)
+    for i in range(count):
+        planner.observe_response(sport, {'x-requests-remaining': str(400 - i)}, [])
+
+
+def test_concurrent_writers_lose_no_sports(tmp_path):
+    state_file = str(tmp_path / 'polling_state.json')
+    sports = [f"sport_{i}" for i in range(4)]
+    processes = [multiprocessing.Process(target=_observe_many, args=(state_file, sport, 25))
+                 for sport in sports]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    with open(state_file) as f:
+        assert sorted(json.load(f)['sports']) == sports
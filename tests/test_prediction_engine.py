@@ -0,0 +1,81 @@
+import pytest
+
+pytest.importorskip('pandas')
+pytest.importorskip('sklearn')
+
+from backend.ml_models.prediction_engine import PredictionEngine
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = PredictionEngine(model_path=str(tmp_path / 'prediction_model.joblib'))
+    engine.train_model()
+    return engine
+
+
+def test_new_teams_never_shift_existing_codes(engine):
+    team_codes = dict(engine.snapshot[2])
+
+    row = engine.build_features('Aardvark Athletic', 'Arsenal', 'EPL', 2.0, 3.0, 3.5)
+
+    assert row[0] == len(team_codes)
+    assert row[1] == team_codes['Arsenal']
+    assert {name: engine.snapshot[2][name] for name in team_codes} == team_codes
+
+
+def test_code_maps_are_saved_and_loaded_with_the_model(engine, tmp_path):
+    engine.build_features('Aardvark Athletic', 'Arsenal', 'EPL', 2.0, 3.0, 3.5)
+    engine.save_model()
+
+    loaded = PredictionEngine(model_path=engine.model_path)
+
+    assert loaded.load_model()
+    assert loaded.snapshot[2] == engine.snapshot[2]
+    assert loaded.snapshot[3] == engine.snapshot[3]
+
+
+def settled(match_id, outcome='home'):
+    return {'match_id': match_id, 'home_team': 'Arsenal', 'away_team': 'Chelsea', 'league': 'EPL',
+            'home_odds': 2.0, 'away_odds': 3.5, 'draw_odds': 3.2, 'outcome': outcome}
+
+
+def test_pending_results_survive_restart_and_are_learned_once(tmp_path):
+    from backend.ml_models.online_learner import OnlineLearner
+
+    engine = PredictionEngine('sgd', model_path=str(tmp_path / 'prediction_model.joblib'))
+    pending_path = str(tmp_path / 'online_pending.joblib')
+    OnlineLearner(engine, pending_path=pending_path).submit([settled('a'), settled('b', 'draw')])
+
+    # A new process sees the queue; resubmitting a queued result is a no-op
+    learner = OnlineLearner(engine, pending_path=pending_path)
+    learner.submit([settled('a')])
+    assert learner.update() == 2
+    assert engine.learned_seq == 2
+
+    assert OnlineLearner(engine, pending_path=pending_path).update() == 0
+
+
+class NoDrawModel:
+    """A model trained on data without draws"""
+    classes_ = ['away', 'home']
+
+    def predict_proba(self, X):
+        return [[0.25, 0.75]] * len(X)
+
+
+def test_outcomes_the_model_never_saw_come_from_the_odds(engine):
+    from backend.ml_models.prediction_engine import outcome_matrix
+
+    engine.swap_model(NoDrawModel(), engine.snapshot[1])
+    fixture = {'home_team': 'Arsenal', 'away_team': 'Chelsea', 'league': 'EPL',
+               'home_odds': 2.0, 'away_odds': 4.0, 'draw_odds': 4.0}
+
+    home, draw, away = engine.predict_probabilities([fixture])[0]
+
+    assert draw == pytest.approx(0.25)
+    assert (home, away) == (pytest.approx(0.5625), pytest.approx(0.1875))
+    assert engine.predict_match('Arsenal', 'Chelsea', 'EPL', 2.0, 4.0, 4.0)['draw_probability'] == \
+        pytest.approx(0.25)
+    # With every class known the model's probabilities are used as they are
+    matrix = outcome_matrix([[0.2, 0.3, 0.5]], ['away', 'draw', 'home'], [[1 / 3] * 3])
+    assert matrix.tolist() == [[0.5, 0.3, 0.2]]
@@ -0,0 +1,59 @@
+import os
+
+from backend.cache.response_cache import ResponseCache, touch_version_file
+
+
+def test_serves_cached_body_until_bump():
+    cache = ResponseCache()
+    entry = cache.set('matches', '{"count": 1}')
+
+    assert cache.get('matches') is entry
+    assert entry.etag == ResponseCache().set('other', '{"count": 1}').etag
+
+    cache.bump()
+    assert cache.get('matches') is None
+
+
+def test_set_after_bump_during_render_is_not_stored():
+    cache = ResponseCache()
+    version = cache.version
+    cache.bump()
+
+    entry = cache.set('matches', '{"count": 1}', version)
+
+    # The caller can still serve what it rendered, but nobody else gets it
+    assert entry.body == '{"count": 1}'
+    assert cache.get('matches') is None
+
+
+def test_max_age_and_lru_eviction():
+    cache = ResponseCache(max_entries=2)
+    cache.set('a', '1')
+    cache.set('b', '2')
+    cache.get('a')
+    cache.set('c', '3')
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c', max_age=0) is None
+
+
+def test_shared_version_file_invalidates_other_processes(tmp_path):
+    version_file = str(tmp_path / 'state' / 'data_version.stamp')
+    web = ResponseCache(version_file=version_file)
+    worker = ResponseCache(version_file=version_file)
+    web.set('matches', '[]')
+
+    worker.bump()
+
+    assert os.path.exists(version_file)
+    assert web.get('matches') is None
+
+
+def test_touch_version_file_always_advances_mtime(tmp_path):
+    version_file = str(tmp_path / 'data_version.stamp')
+    touch_version_file(version_file)
+    first = os.stat(version_file).st_mtime_ns
+    touch_version_file(version_file)
+
+    assert os.stat(version_file).st_mtime_ns > first
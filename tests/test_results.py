@@ -0,0 +1,55 @@
+import os
+from datetime import datetime
+
+import pytest
+
+sqlalchemy = pytest.importorskip('sqlalchemy')
+
+from backend.database.results import INSTANCE_PATH, _resolve_url, load_settled_results
+
+
+def create_tables(database_url, rows_by_table):
+    engine = sqlalchemy.create_engine(database_url)
+    metadata = sqlalchemy.MetaData()
+    for name, rows in rows_by_table.items():
+        table = sqlalchemy.Table(
+            name, metadata,
+            sqlalchemy.Column('id', sqlalchemy.Integer, primary_key=True),
+            sqlalchemy.Column('home_team', sqlalchemy.String),
+            sqlalchemy.Column('away_team', sqlalchemy.String),
+            sqlalchemy.Column('home_score', sqlalchemy.Integer),
+            sqlalchemy.Column('away_score', sqlalchemy.Integer),
+            sqlalchemy.Column('match_status', sqlalchemy.String),
+            sqlalchemy.Column('commence_time', sqlalchemy.DateTime),
+        )
+        metadata.create_all(engine)
+        with engine.begin() as connection:
+            connection.execute(table.insert(), rows)
+    engine.dispose()
+
+
+def row(home_team, day, status='Final', score=(1, 0)):
+    return {'home_team': home_team, 'away_team': 'Chelsea', 'home_score': score[0],
+            'away_score': score[1], 'match_status': status, 'commence_time': datetime(2024, 9, day)}
+
+
+def test_loads_final_results_from_both_tables_without_flask(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'app.db'}"
+    create_tables(database_url, {
+        'matches': [row('Arsenal', 20), row('Everton', 21, 'In Progress')],
+        'archived_matches': [row('Fulham', 2, score=(2, 2))],
+    })
+
+    results = load_settled_results(database_url)
+
+    assert [r['home_team'] for r in results] == ['Fulham', 'Arsenal']
+    assert (results[0]['home_goals'], results[0]['away_goals']) == (2, 2)
+
+
+def test_missing_tables_give_no_results(tmp_path):
+    assert load_settled_results(f"sqlite:///{tmp_path / 'empty.db'}") == []
+
+
+def test_relative_sqlite_path_resolves_like_flask_sqlalchemy():
+    assert _resolve_url('sqlite:///sports.db').database == os.path.join(INSTANCE_PATH, 'sports.db')
+    assert _resolve_url('sqlite:////data/sports.db').database == '/data/sports.db'
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from backend.data_processing.team_resolver import FixtureIndex, TeamNameResolver, normalize_team_name
+
+
+def fixture(home_team, away_team, commence_time):
+    return SimpleNamespace(home_team=home_team, away_team=away_team, commence_time=commence_time)
+
+
+def test_normalize_strips_accents_punctuation_and_noise():
+    assert normalize_team_name('Atlético de Madrid') == 'atletico madrid'
+    assert normalize_team_name('Brighton & Hove Albion FC') == 'brighton and hove albion'
+    assert normalize_team_name(None) == ''
+
+
+def test_resolves_aliases_and_normalized_spellings():
+    resolver = TeamNameResolver()
+
+    assert resolver.resolve('Spurs') == 'Tottenham Hotspur'
+    assert resolver.resolve('man. utd') == 'Manchester United'
+    assert resolver.resolve('AFC Bournemouth') == 'AFC Bournemouth'
+    assert resolver.resolve('Brighton & Hove Albion FC') == 'Brighton and Hove Albion'
+
+
+def test_fuzzy_match_and_unknown_names():
+    resolver = TeamNameResolver()
+
+    assert resolver.resolve('Wolverhampton Wanderer') == 'Wolverhampton Wanderers'
+    assert resolver.resolve('Real Madrid') is None
+    assert resolver.canonical('Real Madrid') == 'Real Madrid'
+    assert resolver.resolve('') is None
+
+
+def test_add_team_invalidates_cached_fuzzy_misses():
+    resolver = TeamNameResolver(aliases={'Arsenal': []})
+    assert resolver.resolve('Real Madrid CF') is None
+
+    resolver.add_team('Real Madrid', ['Real Madrid CF'])
+
+    assert resolver.resolve('Real Madrid CF') == 'Real Madrid'
+    assert resolver.resolve('Reall Madrid') == 'Real Madrid'
+
+
+def test_fixture_index_matches_feed_spellings_within_time_gap():
+    kickoff = datetime(2024, 3, 2, 15, 0)
+    first = fixture('Manchester United', 'Tottenham Hotspur', kickoff)
+    rematch = fixture('Manchester United', 'Tottenham Hotspur', kickoff + timedelta(days=30))
+    index = FixtureIndex(TeamNameResolver()).build([first, rematch])
+
+    assert len(index) == 2
+    assert index.lookup('Man Utd', 'Spurs', kickoff + timedelta(hours=1)) is first
+    assert index.lookup('Man Utd', 'Spurs', kickoff + timedelta(days=30, hours=-2)) is rematch
+    assert index.lookup('Man Utd', 'Spurs', kickoff + timedelta(days=10)) is None
+    assert index.lookup('Man Utd', 'Spurs') is first
+    # Home and away are not interchangeable
+    assert index.lookup('Spurs', 'Man Utd', kickoff) is None
+
+
+def test_fixture_index_compares_aware_and_naive_times():
+    kickoff = datetime(2024, 3, 2, 15, 0)
+    match = fixture('Arsenal', 'Chelsea', kickoff)
+    index = FixtureIndex(TeamNameResolver(), max_time_gap_hours=1).build([match])
+
+    local_kickoff = datetime(2024, 3, 2, 16, 30, tzinfo=timezone(timedelta(hours=1)))
+    assert index.lookup('Arsenal FC', 'Chelsea FC', local_kickoff) is match
@@ -0,0 +1,71 @@
+import time
+
+import pytest
+
+from backend.ingestion.work_queue import (MemoryWorkQueue, SQLiteWorkQueue, WorkQueue,
+                                          create_work_queue)
+
+
+@pytest.fixture(params=['sqlite', 'memory'])
+def queue(request, tmp_path):
+    if request.param == 'sqlite':
+        return SQLiteWorkQueue(str(tmp_path / 'queue.db'))
+    return MemoryWorkQueue()
+
+
+def test_work_queue_is_abstract():
+    with pytest.raises(TypeError):
+        WorkQueue()
+
+
+def test_put_lease_ack(queue):
+    assert queue.put('odds', {'sports': ['soccer_epl']}, shard=1)
+
+    assert queue.lease(0) is None
+    job = queue.lease(1)
+    assert (job.kind, job.payload, job.attempts) == ('odds', {'sports': ['soccer_epl']}, 1)
+
+    queue.ack(job)
+    assert queue.lease(1, lease_seconds=0) is None
+
+
+def test_put_skips_identical_waiting_job(queue):
+    assert queue.put('settle', {})
+    assert not queue.put('settle', {})
+    assert queue.put('archive', {})
+
+
+def test_failed_job_is_retried_then_parked(queue):
+    queue.put('odds', {'sports': ['soccer_epl']})
+
+    for attempt in (1, 2, 3):
+        job = queue.lease(0)
+        assert job.attempts == attempt
+        queue.fail(job, max_attempts=3)
+
+    assert queue.lease(0) is None
+
+
+def test_expired_lease_is_handed_out_again(queue):
+    queue.put('live_scores', {})
+    first = queue.lease(0, lease_seconds=0)
+    time.sleep(0.01)
+
+    second = queue.lease(0)
+    assert second.id == first.id
+    assert second.attempts == 2
+
+
+def test_create_work_queue_from_url(tmp_path):
+    assert isinstance(create_work_queue(f"sqlite:///{tmp_path}/queue.db"), SQLiteWorkQueue)
+    with pytest.raises(ValueError):
+        create_work_queue('redis://localhost')
+
+
+def test_put_skips_identical_running_job(queue):
+    queue.put('odds', {'sports': ['soccer_epl']})
+    job = queue.lease(0)
+
+    assert not queue.put('odds', {'sports': ['soccer_epl']})
+    queue.ack(job)
+    assert queue.put('odds', {'sports': ['soccer_epl']})